@@ -7,16 +7,16 @@ import os
 import sys
 import subprocess
 import shutil
+import tempfile
 from pathlib import Path
 
 def run_command(cmd, cwd=None):
-    """Run a command and return the result."""
+    """Run a command, streaming its output straight to the terminal."""
     print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    result = subprocess.run(cmd, cwd=cwd)
     if result.returncode != 0:
-        print(f"Error: {result.stderr}")
+        print(f"Error: command exited with status {result.returncode}")
         sys.exit(1)
-    return result.stdout
 
 def main():
     """Build the standalone binary locally."""
@@ -28,26 +28,28 @@ def main():
     
     # Install build dependencies
     print("Installing build dependencies...")
-    run_command([sys.executable, "-m", "pip", "install", "-e", ".[build]"])
-    run_command([sys.executable, "-m", "pip", "install", "pyinstaller[encryption]"])
+    lock_file = project_dir / "requirements-build.lock"
+    if lock_file.exists():
+        # Pinned set: skip pip's resolver entirely
+        run_command([sys.executable, "-m", "pip", "install", "--no-deps", "-r", str(lock_file)])
+        run_command([sys.executable, "-m", "pip", "install", "--no-deps", "-e", "."])
+    else:
+        run_command([sys.executable, "-m", "pip", "install", "-e", ".[build]"])
+        run_command([sys.executable, "-m", "pip", "install", "pyinstaller[encryption]"])
     
     # Create PyInstaller spec file
     print("Creating PyInstaller spec file...")
     spec_content = '''# -*- mode: python ; coding: utf-8 -*-
 import sys
+import sysconfig
 from pathlib import Path
 
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
 block_cipher = None
 
 # Get site-packages path
-site_packages = None
-for path in sys.path:
-    if 'site-packages' in path:
-        site_packages = Path(path)
-        break
-
-if site_packages is None:
-    raise RuntimeError("Could not find site-packages directory")
+site_packages = Path(sysconfig.get_paths()["purelib"])
 
 # Find weasyprint data
 weasyprint_data = []
@@ -56,14 +58,9 @@ if weasyprint_path.exists():
     weasyprint_data.append((str(weasyprint_path / "css"), "weasyprint/css"))
     weasyprint_data.append((str(weasyprint_path / "html"), "weasyprint/html"))
 
-# Find markdown-pdf data
-markdown_pdf_data = []
-markdown_pdf_path = site_packages / "markdown_pdf"
-if markdown_pdf_path.exists():
-    for item in markdown_pdf_path.rglob("*"):
-        if item.is_file() and not item.name.endswith('.pyc'):
-            rel_path = item.relative_to(site_packages)
-            markdown_pdf_data.append((str(item), str(rel_path.parent)))
+# Find markdown-pdf data and submodules
+markdown_pdf_data = collect_data_files('markdown_pdf')
+markdown_pdf_modules = collect_submodules('markdown_pdf')
 
 a = Analysis(
     ['grimd2pdf/standalone_server.py'],
@@ -80,26 +77,26 @@ a = Analysis(
         'tinycss2',
         'pyphen',
         'markdown_pdf',
+        *markdown_pdf_modules,
         'uvicorn.logging',
         'uvicorn.loops',
         'uvicorn.loops.auto',
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
-        'uvicorn.protocols.websockets',
-        'uvicorn.protocols.websockets.auto',
         'uvicorn.lifespan',
         'uvicorn.lifespan.on',
         'click',
     ],
     hookspath=[],
     hooksconfig={},
-    runtime_hooks=[],
-    excludes=[],
+    runtime_hooks=[RUNTIME_HOOK],
+    excludes=['websockets', 'wsproto'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    optimize=1,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
@@ -114,9 +111,9 @@ exe = EXE(
     name='md2pdf-server',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
+    strip=sys.platform != 'win32',
     upx=True,
-    upx_exclude=[],
+    upx_exclude=['vcruntime140.dll'],
     runtime_tmpdir=None,
     console=True,
     disable_windowed_traceback=False,
@@ -127,12 +124,19 @@ exe = EXE(
 )
 '''
     
-    with open('md2pdf-server.spec', 'w') as f:
-        f.write(spec_content)
-    
-    # Build with PyInstaller
+    # Build with PyInstaller; PyInstaller already passes --best, UPX reads extra flags from $UPX
     print("Building binary with PyInstaller...")
-    run_command([sys.executable, "-m", "PyInstaller", "md2pdf-server.spec", "--clean", "--noconfirm"])
+    os.environ.setdefault("UPX", "--lzma")
+    with tempfile.TemporaryDirectory(prefix="grimd2pdf-build-") as hook_dir:
+        # The HTTP server never serves FastMCP resources/prompts, so skip registering them;
+        # the hook only lives for the build so it never lands in the source tree
+        hook_path = Path(hook_dir) / "pyi_rth_grimd2pdf.py"
+        hook_path.write_text('import os\nos.environ.setdefault("GRIMD2PDF_MCP", "0")\n')
+        
+        with open('md2pdf-server.spec', 'w') as f:
+            f.write(spec_content.replace("RUNTIME_HOOK", repr(str(hook_path))))
+        
+        run_command([sys.executable, "-m", "PyInstaller", "md2pdf-server.spec", "--clean", "--noconfirm"])
     
     # Test the binary
     print("Testing the binary...")
@@ -8,12 +8,24 @@ __version__ = "0.1.0"
 __author__ = "Grimd2pdf Team"
 __email__ = "grimd2pdf@example.com"
 
+import logging
+
+# Library use: stay silent unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 from .server import convert_markdown_to_pdf, convert_markdown_file_to_pdf, health_check
-from .standalone_server import create_http_app
 
 __all__ = [
     "convert_markdown_to_pdf",
     "convert_markdown_file_to_pdf", 
     "health_check",
     "create_http_app",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # The HTTP app pulls in FastAPI; import it only when it is asked for
+    if name == "create_http_app":
+        from .standalone_server import create_http_app
+        return create_http_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,23 +6,246 @@ A Model Context Protocol server that provides magical tools for converting markd
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import binascii
+import functools
+import hashlib
+import io
+import json
 import logging
+import multiprocessing
 import os
-import tempfile
+import stat
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 from mcp.server import FastMCP
-from markdown_pdf import MarkdownPdf, Section
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the entry points (see configure_logging); importing
+# the package as a library leaves the root logger alone
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 logger = logging.getLogger(__name__)
 
-# Initialize MCP server
-mcp = FastMCP("Grimd2pdf - Mystical Markdown to PDF Converter")
+
+def _env_log_level(default: str) -> str:
+    """Return LOG_LEVEL from the environment if it names a level, else default."""
+    level = os.environ.get("LOG_LEVEL", "").upper()
+    return level if level in _LOG_LEVELS else default
+
+
+def configure_logging(default_level: str = "WARNING", fmt: Optional[str] = None) -> None:
+    """
+    Configure root logging for a server entry point.
+    
+    Args:
+        default_level: Level used when LOG_LEVEL is unset or invalid
+        fmt: Log record format (default: the logging module's)
+    """
+    logging.basicConfig(level=_env_log_level(default_level), format=fmt or logging.BASIC_FORMAT)
+
+
+# Initialize MCP server. FastMCP calls logging.basicConfig as it is constructed,
+# so put the root logger back the way it was and leave that to the entry points
+_root_logger = logging.getLogger()
+_root_handlers, _root_level = _root_logger.handlers[:], _root_logger.level
+mcp = FastMCP("Grimd2pdf - Mystical Markdown to PDF Converter", log_level=_env_log_level("WARNING"))
+_root_logger.handlers[:] = _root_handlers
+_root_logger.setLevel(_root_level)
+
+
+def _max_workers_from_env() -> int:
+    """Read MAX_WORKERS; unset or 0 means the CPU count, invalid values fall back to it."""
+    default = os.cpu_count() or 2
+    value = os.environ.get("MAX_WORKERS", "").strip()
+    try:
+        workers = int(value or 0)
+    except ValueError:
+        workers = -1
+    if workers < 0:
+        logger.warning("Ignoring MAX_WORKERS=%r; expected a positive integer, using %d", value, default)
+    return workers if workers > 0 else default
+
+
+# Worker threads for MCP tool calls; FastMCP runs sync tools on its event loop.
+# Created on first tool call, after the entry point has configured logging, so a
+# bad MAX_WORKERS warning is not swallowed at import
+_RENDER_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _get_render_pool() -> ThreadPoolExecutor:
+    """Return the MCP tool thread pool, creating it on first call."""
+    global _RENDER_POOL
+    if _RENDER_POOL is None:
+        _RENDER_POOL = ThreadPoolExecutor(
+            max_workers=_max_workers_from_env(),
+            thread_name_prefix="md2pdf",
+        )
+    return _RENDER_POOL
+
+
+def _pooled_tool(func):
+    """
+    Register a blocking function as an MCP tool that runs on the render pool.
+    
+    The function itself is returned unchanged so direct callers stay synchronous.
+    """
+    @functools.wraps(func)
+    async def tool(**kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_render_pool(), functools.partial(func, **kwargs))
+    
+    mcp.tool()(tool)
+    return func
+
+
+# markdown_pdf pulls in PyMuPDF, which dominates import time; load it on first use
+_PDF_CLS = None
+
+
+def _get_pdf_cls():
+    """Return the (MarkdownPdf, Section) classes, importing markdown_pdf on first call."""
+    global _PDF_CLS
+    if _PDF_CLS is None:
+        from markdown_pdf import MarkdownPdf, Section
+        _PDF_CLS = (MarkdownPdf, Section)
+    return _PDF_CLS
+
+
+# Patterns used by sanitize_markdown_content and validate_markdown_structure
+_CTRL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+# Same characters as a str.translate table; only fast for ASCII-only strings
+_CTRL_CHARS_TRANS = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0)]
+)
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+# A list marker missing its space, or a code fence followed by a blank line
+_LIST_OR_FENCE_RE = re.compile(
+    r'^(?:(?P<marker>\s*(?:[-*]|\d+\.))(?=\S)|(?P<fence>```\w*\n)\n)',
+    re.MULTILINE
+)
+_BLANK_RUN_RE = re.compile(r'\n{4,}')
+# A maximal run of consecutive lines that each contain a pipe
+_TABLE_BLOCK_RE = re.compile(r'^[^\n|]*\|[^\n]*(?:\n[^\n|]*\|[^\n]*)*', re.MULTILINE)
+# A block in which every line starts and ends with a pipe (ignoring whitespace)
+_CLOSED_ROWS_RE = re.compile(
+    r'[^\S\n]*\|(?:[^\n]*\|)?[^\S\n]*(?:\n[^\S\n]*\|(?:[^\n]*\|)?[^\S\n]*)*'
+)
+# A line that does not both start and end with a pipe (ignoring whitespace)
+_OPEN_ROW_RE = re.compile(r'^(?:[^\S\n]*[^|\s][^\n]*|[^\n]*[^|\s][^\S\n]*)$', re.MULTILINE)
+# A line containing exactly one pipe
+_SINGLE_PIPE_LINE_RE = re.compile(r'^[^|\n]*\|[^|\n]*$', re.MULTILINE)
+# Lines too long to render reliably
+_MAX_LINE_LENGTH = 10000
+_LONG_LINE_RE = re.compile(r'^[^\n]{%d}[^\n]+' % _MAX_LINE_LENGTH, re.MULTILINE)
+
+
+def _plain_text_row(stripped: str) -> Optional[str]:
+    """Return a stripped line as a table row if it looks like separated cells."""
+    for sep in ('\t', '  ', ' '):  # Tab, double space, single space
+        if sep in stripped:
+            cells = [cell.strip() for cell in stripped.split(sep) if cell.strip()]
+            if len(cells) >= 2:
+                return '| ' + ' | '.join(cells) + ' |'
+            return None
+    return None
+
+
+def _fix_tables(text: str, warnings: List[str]) -> str:
+    """
+    Add missing table header separators and outer pipes, appending warnings.
+    
+    Table blocks are located and checked with compiled patterns; only rows that
+    need fixing, and plain lines directly following a table, are handled in
+    Python. All other text is copied through in bulk.
+    """
+    parts = []
+    copied = 0          # text[:copied] has been emitted
+    counted = 0         # line_index is the zero-based line number at counted
+    line_index = 0
+    table_end = None    # start of the line after the current table, if any
+    size = len(text)
+    
+    def line_at(pos: int) -> int:
+        nonlocal counted, line_index
+        line_index += text.count('\n', counted, pos)
+        counted = pos
+        return line_index
+    
+    def extend_table(pos: Optional[int], limit: int) -> Optional[int]:
+        # Convert pipe-less rows following a table until one does not fit
+        nonlocal copied
+        while pos is not None and pos < limit:
+            eol = text.find('\n', pos)
+            if eol == -1:
+                eol = size
+            stripped = text[pos:eol].strip()
+            row = _plain_text_row(stripped) if stripped else None
+            if row is None:
+                return None
+            parts.append(text[copied:pos])
+            parts.append(row)
+            copied = eol
+            warnings.append(f"Converted plain text to table row at line {line_at(pos) + 1}")
+            pos = eol + 1 if eol < size else None
+        return pos
+    
+    for block in _TABLE_BLOCK_RE.finditer(text):
+        start, end = block.span()
+        if table_end is not None and table_end != start:
+            table_end = extend_table(table_end, start)
+        
+        # A table starting below other content gets a header separator
+        lineno = line_at(start) + 1
+        if table_end != start and lineno > 1:
+            eol = text.find('\n', start, end)
+            pipe_count = text.count('|', start, end if eol == -1 else eol)
+            parts.append(text[copied:start])
+            parts.append('|' + '---|' * (pipe_count if pipe_count >= 2 else 2) + '\n')
+            copied = start
+            warnings.append(f"Added missing table header separator at line {lineno}")
+        
+        # Fix malformed table rows
+        if _CLOSED_ROWS_RE.fullmatch(text, start, end):
+            rows = ()
+        else:
+            rows = _OPEN_ROW_RE.finditer(text, start, end)
+        for row in rows:
+            line = row.group()
+            stripped_line = line.strip()
+            if stripped_line[:1] == '|':
+                line = line.rstrip() + '|'
+            elif stripped_line[-1:] == '|':
+                line = '|' + line
+            else:
+                line = '|' + line.rstrip() + '|'
+            parts.append(text[copied:row.start()])
+            parts.append(line)
+            copied = row.end()
+            warnings.append(f"Fixed incomplete table row at line {line_at(row.start()) + 1}")
+        
+        table_end = end + 1 if end < size else None
+    
+    if table_end is not None:
+        extend_table(table_end, size + 1)
+    
+    if not parts:
+        return text
+    parts.append(text[copied:])
+    return ''.join(parts)
+
+
+def _fix_list_or_fence(match: re.Match) -> str:
+    """Replacement for _LIST_OR_FENCE_RE matches."""
+    fence = match.group('fence')
+    if fence is not None:
+        return fence
+    return match.group('marker') + ' '
 
 
 def sanitize_markdown_content(content: str) -> Tuple[str, List[str]]:
@@ -38,107 +261,46 @@ def sanitize_markdown_content(content: str) -> Tuple[str, List[str]]:
     warnings = []
     sanitized = content
     
-    # Remove null bytes and control characters that can cause issues
-    sanitized = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', sanitized)
+    # Remove null bytes and control characters that can cause issues.
+    # translate() is much faster for ASCII text but slower than the regex
+    # once the string holds wider characters.
+    if sanitized.isascii():
+        sanitized = sanitized.translate(_CTRL_CHARS_TRANS)
+    else:
+        sanitized = _CTRL_CHARS_RE.sub('', sanitized)
+    
+    # Each pass below is skipped when its trigger character cannot occur;
+    # a substring test is far cheaper than running the pattern
     
     # Fix common table formatting issues
-    lines = sanitized.split('\n')
-    fixed_lines = []
-    in_table = False
-    table_columns = 0
+    if '|' in sanitized:
+        sanitized = _fix_tables(sanitized, warnings)
     
-    for i, line in enumerate(lines):
-        stripped_line = line.strip()
-        
-        # Detect table rows
-        if '|' in stripped_line and stripped_line:
-            if not in_table:
-                in_table = True
-                table_columns = stripped_line.count('|') + 1
-                # Check if previous line should be a table header
-                if i > 0 and fixed_lines and not fixed_lines[-1].strip().startswith('|'):
-                    # Add table header separator if missing
-                    pipe_count = stripped_line.count('|')
-                    if pipe_count >= 1:  # At least one column
-                        separator = '|' + '---|' * (pipe_count if pipe_count >= 2 else 2)
-                        if not separator.endswith('|'):
-                            separator += '|'
-                        fixed_lines.append(separator)
-                        warnings.append(f"Added missing table header separator at line {i+1}")
-            
-            # Fix malformed table rows
-            if stripped_line.startswith('|') and not stripped_line.endswith('|'):
-                line = line.rstrip() + '|'
-                warnings.append(f"Fixed incomplete table row at line {i+1}")
-            elif not stripped_line.startswith('|') and stripped_line.endswith('|'):
-                line = '|' + line
-                warnings.append(f"Fixed incomplete table row at line {i+1}")
-            elif not stripped_line.startswith('|') and not stripped_line.endswith('|'):
-                # Line has pipes but isn't properly formatted as table row
-                line = '|' + line.rstrip() + '|'
-                warnings.append(f"Fixed incomplete table row at line {i+1}")
-                
-        elif in_table and stripped_line and '|' not in stripped_line:
-            # Check if this might be a continuation of table data without pipes
-            # Split by common delimiters to see if it looks like tabular data
-            potential_cells = None
-            
-            # Try different separators
-            for sep in ['\t', '  ', ' ']:  # Tab, double space, single space
-                if sep in stripped_line:
-                    potential_cells = [cell.strip() for cell in stripped_line.split(sep) if cell.strip()]
-                    break
-            
-            # If we found what looks like tabular data, convert it to table row
-            if potential_cells and len(potential_cells) >= 2:
-                line = '| ' + ' | '.join(potential_cells) + ' |'
-                warnings.append(f"Converted plain text to table row at line {i+1}")
-            else:
-                in_table = False
-        elif in_table and not stripped_line:
-            # Empty line - end of table
-            in_table = False
-        else:
-            in_table = False
-            
-        fixed_lines.append(line)
+    # Fix heading hierarchy issues (e.g. # directly to ###) in a single pass
+    prev_level = 0
     
-    sanitized = '\n'.join(fixed_lines)
+    def fix_heading(match: re.Match) -> str:
+        nonlocal prev_level
+        current_level = len(match.group(1))
+        if prev_level > 0 and current_level > prev_level + 1:
+            # Found a level jump; reduce to the next level down
+            proper_level = prev_level + 1
+            warnings.append(f"Fixed heading hierarchy jump from level {prev_level} to {current_level}")
+            prev_level = proper_level
+            return '#' * proper_level + ' ' + match.group(2)
+        prev_level = current_level
+        return match.group(0)
     
-    # Fix heading hierarchy issues
-    headings = re.findall(r'^(#{1,6})\s+(.+)$', sanitized, re.MULTILINE)
-    if headings:
-        # Check for heading level jumps that might cause hierarchy errors
-        prev_level = 0
-        heading_fixes = []
-        
-        for match in re.finditer(r'^(#{1,6})\s+(.+)$', sanitized, re.MULTILINE):
-            current_level = len(match.group(1))
-            if prev_level > 0 and current_level > prev_level + 1:
-                # Found a level jump (e.g., # to ###)
-                # Fix by reducing to appropriate level
-                proper_level = prev_level + 1
-                proper_heading = '#' * proper_level + ' ' + match.group(2)
-                heading_fixes.append((match.group(0), proper_heading))
-                warnings.append(f"Fixed heading hierarchy jump from level {prev_level} to {current_level}")
-                prev_level = proper_level
-            else:
-                prev_level = current_level
-        
-        # Apply heading fixes
-        for old_heading, new_heading in heading_fixes:
-            sanitized = sanitized.replace(old_heading, new_heading, 1)
-    
-    # Fix list formatting issues
-    sanitized = re.sub(r'^(\s*)-(\S)', r'\1- \2', sanitized, flags=re.MULTILINE)
-    sanitized = re.sub(r'^(\s*)\*(\S)', r'\1* \2', sanitized, flags=re.MULTILINE)
-    sanitized = re.sub(r'^(\s*)\d+\.(\S)', r'\1\g<0> \2', sanitized, flags=re.MULTILINE)
+    if '#' in sanitized:
+        sanitized = _HEADING_RE.sub(fix_heading, sanitized)
     
-    # Fix code block formatting
-    sanitized = re.sub(r'^```(\w+)?\n\n', r'```\1\n', sanitized, flags=re.MULTILINE)
+    # Fix list markers missing a space and drop blank lines after code fences
+    if '-' in sanitized or '*' in sanitized or '.' in sanitized or '```' in sanitized:
+        sanitized = _LIST_OR_FENCE_RE.sub(_fix_list_or_fence, sanitized)
     
     # Remove excessive blank lines that can cause parsing issues
-    sanitized = re.sub(r'\n{4,}', '\n\n\n', sanitized)
+    if '\n\n\n\n' in sanitized:
+        sanitized = _BLANK_RUN_RE.sub('\n\n\n', sanitized)
     
     # Ensure content ends with a newline
     if not sanitized.endswith('\n'):
@@ -147,6 +309,60 @@ def sanitize_markdown_content(content: str) -> Tuple[str, List[str]]:
     return sanitized, warnings
 
 
+def _structure_errors(content: str) -> List[str]:
+    """Return structural problems in non-empty markdown without splitting it into lines."""
+    errors = []
+    
+    # Rows that start or end with a pipe but have no other column separator
+    if '|' in content:
+        counted = 0
+        lineno = 1
+        for match in _SINGLE_PIPE_LINE_RE.finditer(content):
+            stripped_line = match.group().strip()
+            if stripped_line[:1] != '|' and stripped_line[-1:] != '|':
+                continue
+            lineno += content.count('\n', counted, match.start())
+            counted = match.start()
+            errors.append(f"Malformed table row at line {lineno}: insufficient column separators")
+    
+    # Check for unclosed code blocks
+    if content.count('```') % 2 != 0:
+        errors.append("Unclosed code block detected")
+    
+    # Check for extremely long lines that might cause rendering issues
+    if len(content) > _MAX_LINE_LENGTH:
+        for match in _LONG_LINE_RE.finditer(content):
+            lineno = content.count('\n', 0, match.start()) + 1
+            errors.append(f"Extremely long line at {lineno}: {len(match.group())} characters")
+    
+    return errors
+
+
+def sanitize_and_validate(content: str) -> Tuple[str, List[str], List[str]]:
+    """
+    Sanitize markdown and check the result for structural issues in one call.
+    
+    Args:
+        content: Raw markdown content
+        
+    Returns:
+        Tuple of (sanitized_content, list_of_warnings, list_of_errors)
+    """
+    sanitized, warnings = sanitize_markdown_content(content)
+    return sanitized, warnings, _structure_errors(sanitized)
+
+
+# Inputs above this size skip the sanitize and HTML caches so they cannot pin large documents
+_MEMO_MAX_CHARS = 256 * 1024
+
+
+@functools.lru_cache(maxsize=128)
+def _sanitize_and_validate_cached(content: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """Memoized sanitize_and_validate with immutable results."""
+    sanitized, warnings, errors = sanitize_and_validate(content)
+    return sanitized, tuple(warnings), tuple(errors)
+
+
 def validate_markdown_structure(content: str) -> Tuple[bool, List[str]]:
     """
     Validate markdown structure and identify potential issues.
@@ -160,63 +376,444 @@ def validate_markdown_structure(content: str) -> Tuple[bool, List[str]]:
     errors = []
     
     # Check for empty content
-    if not content.strip():
+    if not content or content.isspace():
         errors.append("Content is empty")
         return False, errors
     
-    # Check for malformed tables
-    lines = content.split('\n')
-    in_table_context = False
+    errors.extend(_structure_errors(content))
+    return len(errors) == 0, errors
+
+
+# File extensions accepted by convert_markdown_file_to_pdf
+_MARKDOWN_SUFFIXES = frozenset({'.md', '.markdown', '.txt'})
+
+# (page_size, margin_top, margin_right, margin_bottom, margin_left) defaults
+_DEFAULT_PAGE_ARGS = ("A4", "1in", "1in", "1in", "1in")
+
+
+# PDF points per CSS length unit accepted for margins
+_LENGTH_UNITS = {"in": 72.0, "cm": 72 / 2.54, "mm": 72 / 25.4, "pt": 1.0, "px": 0.75}
+_LENGTH_RE = re.compile(r'(\d+(?:\.\d*)?|\.\d+)\s*(in|cm|mm|pt|px)?', re.IGNORECASE)
+
+
+def _length_to_points(value: str) -> float:
+    """Convert a CSS length such as '1in' or '2.5cm' to PDF points; bare numbers are points."""
+    match = _LENGTH_RE.fullmatch(str(value).strip())
+    if match is None:
+        raise ValueError(f"Invalid margin '{value}': expected a number, optionally with in, cm, mm, pt or px")
+    return float(match.group(1)) * _LENGTH_UNITS[(match.group(2) or "pt").lower()]
+
+
+@functools.lru_cache(maxsize=64)
+def _page_layout(page_size: str, margin_top: str, margin_right: str,
+                 margin_bottom: str, margin_left: str) -> Tuple[str, Tuple[float, ...]]:
+    """
+    Return the (paper_size, borders) arguments for a markdown_pdf Section.
+    
+    Raises ValueError for an unknown page size, an unparseable margin, or
+    margins that leave no room for content.
+    """
+    import pymupdf  # deferred like markdown_pdf; PyMuPDF dominates import time
     
-    for i, line in enumerate(lines, 1):
-        stripped_line = line.strip()
+    top, right, bottom, left = (
+        _length_to_points(margin) for margin in (margin_top, margin_right, margin_bottom, margin_left)
+    )
+    rect = pymupdf.paper_rect(page_size)
+    if rect.is_empty:
+        raise ValueError(f"Unknown page size '{page_size}'")
+    if left + right >= rect.width or top + bottom >= rect.height:
+        raise ValueError(f"Margins leave no room for content on page size '{page_size}'")
+    return page_size, (left, top, -right, -bottom)
+
+
+def _validate_page_args(page_args: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    """Return an error result if the page size or margins are unusable, else None."""
+    if not all(isinstance(arg, str) for arg in page_args):
+        error = "Invalid page settings: page_size and margins must be strings"
+    else:
+        try:
+            _page_layout(*page_args)
+            return None
+        except ValueError as e:
+            error = str(e)
+    return {
+        "success": False,
+        "error": error,
+        "error_type": "ValueError",
+        "message": f"Failed to convert markdown to PDF: {error}"
+    }
+
+
+# Rendered PDFs keyed by (content digest, *page args), least recently used first
+_PDF_CACHE: "OrderedDict[tuple, Tuple[bytes, Tuple[str, ...]]]" = OrderedDict()
+_PDF_CACHE_LOCK = threading.Lock()
+_PDF_CACHE_MAX_ENTRIES = 32
+_PDF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_pdf_cache_bytes = 0
+
+# Optional on-disk tier so renders survive restarts; unset keeps the cache in memory only.
+# Pruned oldest-first (by mtime; hits refresh it) past the entry or byte limit
+_PDF_CACHE_DIR = os.environ.get("GRIMD2PDF_CACHE_DIR") or None
+_PDF_DISK_CACHE_MAX_ENTRIES = 1024
+_PDF_DISK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=1)
+def _renderer_version() -> str:
+    """Versions of grimd2pdf and its rendering stack, so upgrades miss old disk entries."""
+    from importlib.metadata import PackageNotFoundError, version
+    
+    versions = []
+    for dist in ("grimd2pdf", "markdown-pdf", "pymupdf"):
+        try:
+            versions.append(f"{dist}={version(dist)}")
+        except PackageNotFoundError:
+            versions.append(f"{dist}=unknown")
+    return ";".join(versions)
+
+
+def _pdf_cache_key(markdown_content: str, page_args: Tuple[str, ...]) -> tuple:
+    """Build the render cache key for markdown content and page settings."""
+    digest = hashlib.blake2b(markdown_content.encode('utf-8'), digest_size=16).digest()
+    return (digest,) + page_args
+
+
+def _pdf_cache_path(key: tuple) -> Optional[Path]:
+    """Return the on-disk cache path (without suffix) for key, or None if disabled."""
+    if not _PDF_CACHE_DIR:
+        return None
+    name = hashlib.blake2b(repr((_renderer_version(),) + key).encode('utf-8'), digest_size=16).hexdigest()
+    return Path(_PDF_CACHE_DIR) / name
+
+
+def _pdf_cache_load(key: tuple) -> Optional[Tuple[bytes, Tuple[str, ...]]]:
+    """Read a cache entry from the on-disk tier, if enabled and present."""
+    path = _pdf_cache_path(key)
+    if path is None:
+        return None
+    try:
+        pdf_bytes = path.with_suffix('.pdf').read_bytes()
+        warnings = json.loads(path.with_suffix('.json').read_text(encoding='utf-8'))
+        os.utime(path.with_suffix('.pdf'))  # mark as recently used for pruning
+    except (OSError, ValueError):
+        return None
+    return pdf_bytes, tuple(warnings)
+
+
+def _pdf_cache_store(key: tuple, pdf_bytes: bytes, warnings: List[str]) -> None:
+    """Write a cache entry to the on-disk tier; failures only cost the cache hit."""
+    path = _pdf_cache_path(key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write the warnings last so a partial entry is never read back as a hit
+        for suffix, data in (('.pdf', pdf_bytes),
+                             ('.json', json.dumps(warnings).encode('utf-8'))):
+            tmp_path = path.with_suffix(f'{suffix}.{os.getpid()}.{threading.get_ident()}.tmp')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path.with_suffix(suffix))
+    except OSError as e:
+        logger.warning("Could not write PDF cache entry to %s: %s", _PDF_CACHE_DIR, e)
+        return
+    _pdf_cache_prune(path.parent)
+
+
+def _pdf_cache_prune(cache_dir: Path) -> None:
+    """Delete the least recently used on-disk entries past the entry or byte limit."""
+    entries = []
+    for pdf_path in cache_dir.glob('*.pdf'):
+        try:
+            st = pdf_path.stat()
+        except OSError:
+            continue  # removed by a concurrent prune
+        entries.append((st.st_mtime, st.st_size, pdf_path))
+    total_bytes = sum(size for _, size, _ in entries)
+    if len(entries) <= _PDF_DISK_CACHE_MAX_ENTRIES and total_bytes <= _PDF_DISK_CACHE_MAX_BYTES:
+        return
+    
+    entries.sort()
+    for count, (_, size, pdf_path) in enumerate(entries):
+        if (len(entries) - count <= _PDF_DISK_CACHE_MAX_ENTRIES
+                and total_bytes <= _PDF_DISK_CACHE_MAX_BYTES):
+            break
+        try:
+            # Drop the warnings first so a half-deleted entry is never read as a hit
+            pdf_path.with_suffix('.json').unlink(missing_ok=True)
+            pdf_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Could not prune PDF cache entry %s: %s", pdf_path, e)
+        total_bytes -= size
+
+
+def _pdf_cache_get(key: tuple) -> Optional[Tuple[bytes, Tuple[str, ...]]]:
+    """Return cached (pdf_bytes, sanitization_warnings) for key, if present."""
+    with _PDF_CACHE_LOCK:
+        entry = _PDF_CACHE.get(key)
+        if entry is not None:
+            _PDF_CACHE.move_to_end(key)
+            return entry
+    entry = _pdf_cache_load(key)
+    if entry is not None:
+        _pdf_cache_put(key, entry[0], list(entry[1]), persist=False)
+    return entry
+
+
+def _pdf_cache_put(key: tuple, pdf_bytes: bytes, warnings: List[str],
+                   persist: bool = True) -> None:
+    """Store a rendered PDF, evicting old entries past the entry or byte limit."""
+    global _pdf_cache_bytes
+    if persist:
+        _pdf_cache_store(key, pdf_bytes, warnings)
+    if len(pdf_bytes) > _PDF_CACHE_MAX_BYTES:
+        return
+    with _PDF_CACHE_LOCK:
+        old = _PDF_CACHE.pop(key, None)
+        if old is not None:
+            _pdf_cache_bytes -= len(old[0])
+        _PDF_CACHE[key] = (pdf_bytes, tuple(warnings))
+        _pdf_cache_bytes += len(pdf_bytes)
+        while (len(_PDF_CACHE) > _PDF_CACHE_MAX_ENTRIES
+               or _pdf_cache_bytes > _PDF_CACHE_MAX_BYTES):
+            _, (evicted, _) = _PDF_CACHE.popitem(last=False)
+            _pdf_cache_bytes -= len(evicted)
+
+
+class _SectionError(Exception):
+    """A failure while building the PDF document, raised by _render_pdf."""
+    
+    def __init__(self, message: str, error_type: str):
+        super().__init__(message, error_type)
+        self.message = message
+        self.error_type = error_type
+    
+    def __str__(self) -> str:
+        return self.message
+
+
+class _CachedMarkdownIt:
+    """Stand-in for MarkdownPdf.m_d that memoizes the markdown -> HTML step."""
+    
+    def __init__(self, md):
+        self._md = md
+        self._render_cached = functools.lru_cache(maxsize=32)(md.render)
+    
+    def render(self, text: str) -> str:
+        if len(text) > _MEMO_MAX_CHARS:
+            return self._md.render(text)
+        return self._render_cached(text)
+
+
+# Per-process HTML renderer, created from the first MarkdownPdf so it matches its setup
+_HTML_RENDERER: Optional[_CachedMarkdownIt] = None
+
+
+def _render_pdf(markdown_text: str, page_args: Tuple[str, ...] = _DEFAULT_PAGE_ARGS) -> bytes:
+    """
+    Render sanitized markdown to PDF bytes.
+    
+    Kept at module level and free of shared state so it can run in a worker
+    process. Page settings are applied to the section layout rather than the
+    text, so the markdown -> HTML step is shared across page settings. Errors
+    while laying out the section are raised as _SectionError; errors while
+    saving (e.g. bad TOC hierarchy) propagate unchanged.
+    """
+    global _HTML_RENDERER
+    try:
+        logger.debug("Creating MarkdownPdf object")
+        MarkdownPdf, Section = _get_pdf_cls()
+        paper_size, borders = _page_layout(*page_args)
+        section = Section(markdown_text, paper_size=paper_size, borders=borders)
         
-        # Detect if we're in a table context
-        if '|' in stripped_line and stripped_line:
-            # Count pipes to ensure table consistency
-            pipe_count = stripped_line.count('|')
-            
-            # Only report as malformed if it looks like it's trying to be a table row
-            # but doesn't have enough separators
-            if pipe_count >= 1:  # Has at least one pipe, so might be table-related
-                if pipe_count < 2 and (stripped_line.startswith('|') or stripped_line.endswith('|')):
-                    # Looks like a malformed table row (starts or ends with pipe but not enough pipes)
-                    errors.append(f"Malformed table row at line {i}: insufficient column separators")
-                # If it has pipes but doesn't start/end with them, it might just be content with pipes
-                # We'll let the sanitization handle it
-            in_table_context = True
-        elif in_table_context and not stripped_line:
-            # Empty line after table context
-            in_table_context = False
-        elif in_table_context and stripped_line and '|' not in stripped_line:
-            # Non-table content after table context
-            in_table_context = False
-    
-    # Check for heading structure
-    headings = re.findall(r'^(#{1,6})\s+(.+)$', content, re.MULTILINE)
-    if not headings:
-        # No headings found - could be valid, just warn
-        pass
+        pdf = MarkdownPdf(toc_level=6, mode='commonmark', optimize=True)
+        if _HTML_RENDERER is None:
+            _HTML_RENDERER = _CachedMarkdownIt(pdf.m_d)
+        pdf.m_d = _HTML_RENDERER
+        
+        logger.debug("Adding section to PDF")
+        pdf.add_section(section)
+    except Exception as e:
+        raise _SectionError(str(e), type(e).__name__) from e
+    
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    return buffer.getvalue()
+
+
+def warm_up_renderer() -> None:
+    """
+    Load the PDF backend and render a tiny document.
+    
+    The first render in a process pays for importing PyMuPDF and loading fonts
+    and styles (a few hundred ms); servers call this at startup, and render
+    workers run it as their initializer, so the first real request does not.
+    """
+    try:
+        _render_pdf("# Warm-up\n\nReady.")
+    except Exception as e:
+        logger.warning("PDF renderer warm-up failed: %s", e)
+
+
+# Optional process pool for rendering; see enable_process_rendering
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_WORKERS = 0
+
+
+def enable_process_rendering(max_workers: Optional[int] = None) -> None:
+    """
+    Render PDFs in worker processes instead of the calling thread.
+    
+    PyMuPDF layout holds the GIL, so thread-pool tool calls only overlap I/O;
+    a process pool lets concurrent conversions use separate cores. Servers
+    enable this at startup; library callers and tests render in-process.
+    
+    Args:
+        max_workers: Number of worker processes (default: min(4, CPU count))
+    """
+    global _PROCESS_POOL, _PROCESS_POOL_WORKERS
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL_WORKERS = max_workers or min(4, os.cpu_count() or 1)
+        _PROCESS_POOL = _new_process_pool()
+        # Workers start on demand; queue a no-op per worker so all of them
+        # start (and warm up) now rather than on the first requests
+        for _ in range(_PROCESS_POOL_WORKERS):
+            _PROCESS_POOL.submit(os.getpid)
+
+
+def _new_process_pool() -> ProcessPoolExecutor:
+    """Create the render pool; spawn avoids forking a process that has live tool threads."""
+    return ProcessPoolExecutor(
+        max_workers=_PROCESS_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_renderer,
+    )
+
+
+def _render_in_pool(pool: ProcessPoolExecutor, markdown_text: str, page_args: Tuple[str, ...]) -> bytes:
+    """Render markdown_text on the process pool, replacing the pool if a worker died."""
+    global _PROCESS_POOL
+    try:
+        return pool.submit(_render_pdf, markdown_text, page_args).result()
+    except BrokenProcessPool:
+        # A worker crashed (e.g. in native code); later calls get a fresh pool
+        logger.error("PDF render worker exited unexpectedly; restarting process pool")
+        if _PROCESS_POOL is pool:
+            _PROCESS_POOL = _new_process_pool()
+        raise
+
+
+def _render_markdown(
+    markdown_content: str,
+    page_args: Tuple[str, ...]
+) -> Tuple[bytes, List[str], Optional[Dict[str, Any]]]:
+    """
+    Sanitize, validate and render markdown to PDF bytes.
+    
+    Returns:
+        Tuple of (pdf_bytes, sanitization_warnings, failure). failure is an error
+        result dict when the content cannot be rendered, otherwise None.
+    """
+    # Sanitize and validate markdown content; the same text often comes back with
+    # other page settings or after a failed render, which the PDF cache misses
+    if len(markdown_content) <= _MEMO_MAX_CHARS:
+        sanitized_content, warnings, errors = _sanitize_and_validate_cached(markdown_content)
+        sanitization_warnings, validation_errors = list(warnings), list(errors)
     else:
-        # Check for extremely deep nesting that might cause issues
-        max_level = max(len(h[0]) for h in headings)
-        if max_level > 6:
-            errors.append(f"Heading level too deep: {max_level} (maximum is 6)")
+        sanitized_content, sanitization_warnings, validation_errors = sanitize_and_validate(markdown_content)
     
-    # Check for unclosed code blocks
-    code_blocks = content.count('```')
-    if code_blocks % 2 != 0:
-        errors.append("Unclosed code block detected")
+    if validation_errors:
+        logger.warning("Markdown validation failed: %s", validation_errors)
+        return b"", sanitization_warnings, {
+            "success": False,
+            "error": f"Invalid markdown structure: {'; '.join(validation_errors)}",
+            "message": "The provided markdown content has structural issues that prevent PDF conversion",
+            "validation_errors": validation_errors,
+            "sanitization_warnings": sanitization_warnings
+        }
     
-    # Check for extremely long lines that might cause rendering issues
-    for i, line in enumerate(lines, 1):
-        if len(line) > 10000:  # Arbitrary but reasonable limit
-            errors.append(f"Extremely long line at {i}: {len(line)} characters")
+    if sanitization_warnings:
+        logger.info("Applied markdown sanitization fixes: %s", sanitization_warnings)
     
-    return len(errors) == 0, errors
+    # Create a PDF from the markdown content
+    try:
+        pool = _PROCESS_POOL
+        if pool is not None:
+            pdf_bytes = _render_in_pool(pool, sanitized_content, page_args)
+        else:
+            pdf_bytes = _render_pdf(sanitized_content, page_args)
+        
+    except _SectionError as pdf_error:
+        logger.error("Failed to create PDF object: %s", pdf_error)
+        
+        # Check for specific error patterns and provide better error messages
+        error_msg = str(pdf_error)
+        error_str = error_msg.lower()
+        if "hierarchy" in error_str:
+            return b"", sanitization_warnings, {
+                "success": False,
+                "error": f"Markdown hierarchy error: {error_msg}",
+                "message": "The markdown content has heading or structure issues. Try using simpler heading levels or check table formatting.",
+                "suggested_fix": "Ensure headings progress logically (# then ## then ###) and tables have proper formatting with | separators",
+                "sanitization_warnings": sanitization_warnings
+            }
+        elif "table" in error_str or "row" in error_str:
+            return b"", sanitization_warnings, {
+                "success": False,
+                "error": f"Markdown table error: {error_msg}",
+                "message": "The markdown content has table formatting issues.",
+                "suggested_fix": "Check that all table rows have the same number of columns and proper | separators",
+                "sanitization_warnings": sanitization_warnings
+            }
+        else:
+            raise pdf_error
+    
+    return pdf_bytes, sanitization_warnings, None
 
 
-@mcp.tool()
+# Renders in progress, keyed like _PDF_CACHE, so identical concurrent requests share one
+_INFLIGHT_RENDERS: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _render_markdown_once(
+    markdown_content: str,
+    page_args: Tuple[str, ...],
+    cache_key: tuple
+) -> Tuple[bytes, List[str], Optional[Dict[str, Any]]]:
+    """
+    Run _render_markdown, sharing the work among concurrent calls for the same key.
+    
+    The first caller renders and caches the PDF; callers arriving while it is
+    in progress wait for and reuse its outcome (or its exception).
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT_RENDERS.get(cache_key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT_RENDERS[cache_key] = Future()
+    
+    if not owner:
+        logger.debug("Waiting for identical in-flight render")
+        pdf_bytes, warnings, failure = future.result()
+        return pdf_bytes, list(warnings), dict(failure) if failure is not None else None
+    
+    try:
+        pdf_bytes, warnings, failure = _render_markdown(markdown_content, page_args)
+        if failure is None:
+            # Cache before leaving the in-flight table so no caller can miss both
+            _pdf_cache_put(cache_key, pdf_bytes, warnings)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result((pdf_bytes, tuple(warnings), failure))
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT_RENDERS[cache_key]
+    return pdf_bytes, warnings, failure
+
+
+@_pooled_tool
 def convert_markdown_to_pdf(
     markdown_content: str,
     output_filename: Optional[str] = None,
@@ -243,7 +840,55 @@ def convert_markdown_to_pdf(
     Returns:
         Dictionary containing the conversion result
     """
-    # Input validation
+    invalid = _validate_inputs(markdown_content, output_filename)
+    if invalid is not None:
+        return invalid
+    
+    logger.info("Converting markdown to PDF (base64=%s, filename=%s)", return_base64, output_filename)
+    
+    page_args = (page_size, margin_top, margin_right, margin_bottom, margin_left)
+    return _convert_validated(markdown_content, output_filename, return_base64, page_args)
+
+
+def convert_markdown_to_pdf_bytes(
+    markdown_content: str,
+    output_filename: Optional[str] = None,
+    page_size: str = "A4",
+    margin_top: str = "1in",
+    margin_right: str = "1in",
+    margin_bottom: str = "1in",
+    margin_left: str = "1in"
+) -> Dict[str, Any]:
+    """
+    Convert markdown content to PDF and return the raw bytes.
+    
+    Behaves like convert_markdown_to_pdf with return_base64=True, but the
+    result carries the PDF as bytes under "pdf_bytes" instead of "pdf_base64".
+    Not an MCP tool; the HTTP server uses it to send PDFs without a base64
+    round trip.
+    
+    Args:
+        markdown_content: The markdown text to convert to PDF
+        output_filename: Optional filename for the PDF (without extension)
+        page_size: PDF page size (A4, Letter, Legal, etc.)
+        margin_top: Top margin (e.g., '1in', '2.5cm')
+        margin_right: Right margin
+        margin_bottom: Bottom margin
+        margin_left: Left margin
+        
+    Returns:
+        Dictionary containing the conversion result
+    """
+    invalid = _validate_inputs(markdown_content, output_filename)
+    if invalid is not None:
+        return invalid
+    
+    page_args = (page_size, margin_top, margin_right, margin_bottom, margin_left)
+    return _convert_validated(markdown_content, output_filename, True, page_args, raw_bytes=True)
+
+
+def _validate_inputs(markdown_content: Any, output_filename: Any) -> Optional[Dict[str, Any]]:
+    """Return an error result if the conversion inputs are invalid, else None."""
     if not markdown_content or not isinstance(markdown_content, str):
         return {
             "success": False,
@@ -251,7 +896,7 @@ def convert_markdown_to_pdf(
             "message": "Markdown content is required and must be a valid string"
         }
     
-    if markdown_content.strip() == "":
+    if markdown_content.isspace():
         return {
             "success": False,
             "error": "Empty markdown content provided",
@@ -266,130 +911,100 @@ def convert_markdown_to_pdf(
             "message": "Output filename must be a valid string"
         }
     
-    logger.info(f"Converting markdown to PDF (base64={return_base64}, filename={output_filename})")
+    return None
+
+
+def _convert_validated(
+    markdown_content: str,
+    output_filename: Optional[str],
+    return_base64: bool,
+    page_args: Tuple[str, str, str, str, str],
+    raw_bytes: bool = False
+) -> Dict[str, Any]:
+    """
+    Convert markdown that has already passed input validation.
     
-    try:
-        # Sanitize and validate markdown content
-        sanitized_content, sanitization_warnings = sanitize_markdown_content(markdown_content)
-        is_valid, validation_errors = validate_markdown_structure(sanitized_content)
-        
-        if not is_valid:
-            logger.warning(f"Markdown validation failed: {validation_errors}")
-            return {
-                "success": False,
-                "error": f"Invalid markdown structure: {'; '.join(validation_errors)}",
-                "message": "The provided markdown content has structural issues that prevent PDF conversion",
-                "validation_errors": validation_errors,
-                "sanitization_warnings": sanitization_warnings
-            }
+    Args:
+        markdown_content: Non-empty markdown text
+        output_filename: Optional output filename (string or None)
+        return_base64: If True, returns PDF as base64 encoded string
+        page_args: (page_size, margin_top, margin_right, margin_bottom, margin_left)
+        raw_bytes: With return_base64, return the PDF as bytes under "pdf_bytes"
         
-        if sanitization_warnings:
-            logger.info(f"Applied markdown sanitization fixes: {sanitization_warnings}")
+    Returns:
+        Dictionary containing the conversion result
+    """
+    page_size, margin_top, margin_right, margin_bottom, margin_left = page_args
+    
+    # A typo in the page settings is the caller's error, not a render failure
+    page_error = _validate_page_args(page_args)
+    if page_error is not None:
+        return page_error
+    
+    try:
+        cache_key = _pdf_cache_key(markdown_content, page_args)
+        cached = _pdf_cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Reusing cached PDF render")
+            pdf_bytes = cached[0]
+            sanitization_warnings = list(cached[1])
+        else:
+            pdf_bytes, sanitization_warnings, failure = _render_markdown_once(
+                markdown_content, page_args, cache_key
+            )
+            if failure is not None:
+                return failure
         
-        # Create a PDF from the markdown content
-        try:
-            logger.debug("Creating MarkdownPdf object")
-            pdf = MarkdownPdf(toc_level=6, mode='commonmark', optimize=True)
-            
-            # Create section with custom CSS for margins and page size if needed
-            section_content = sanitized_content
-            if page_size != "A4" or any(margin != "1in" for margin in [margin_top, margin_right, margin_bottom, margin_left]):
-                # Add CSS styling for custom page settings
-                css_style = f"""
-                <style>
-                @page {{
-                    size: {page_size};
-                    margin-top: {margin_top};
-                    margin-right: {margin_right};
-                    margin-bottom: {margin_bottom};
-                    margin-left: {margin_left};
-                }}
-                </style>
-                """
-                section_content = css_style + "\n\n" + section_content
-            
-            logger.debug("Adding section to PDF")
-            pdf.add_section(Section(section_content))
-            
-        except Exception as pdf_error:
-            logger.error(f"Failed to create PDF object: {str(pdf_error)}")
-            
-            # Check for specific error patterns and provide better error messages
-            error_str = str(pdf_error).lower()
-            if "hierarchy" in error_str:
-                return {
-                    "success": False,
-                    "error": f"Markdown hierarchy error: {str(pdf_error)}",
-                    "message": "The markdown content has heading or structure issues. Try using simpler heading levels or check table formatting.",
-                    "suggested_fix": "Ensure headings progress logically (# then ## then ###) and tables have proper formatting with | separators",
-                    "sanitization_warnings": sanitization_warnings
-                }
-            elif "table" in error_str or "row" in error_str:
-                return {
-                    "success": False,
-                    "error": f"Markdown table error: {str(pdf_error)}",
-                    "message": "The markdown content has table formatting issues.",
-                    "suggested_fix": "Check that all table rows have the same number of columns and proper | separators",
-                    "sanitization_warnings": sanitization_warnings
-                }
-            else:
-                raise pdf_error
-
         # Generate filename if not provided
         if not output_filename:
             output_filename = "converted_markdown"
         
         # Ensure filename has .pdf extension
-        if not output_filename.endswith('.pdf'):
+        if not output_filename.endswith(('.pdf', '.PDF')):
             output_filename += '.pdf'
 
         if return_base64:
-            # Save to temporary file and return as base64
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-                logger.debug(f"Saving PDF to temporary file: {temp_pdf.name}")
-                pdf.save(temp_pdf.name)
-                
-                # Read the PDF file and encode as base64
-                with open(temp_pdf.name, 'rb') as pdf_file:
-                    pdf_bytes = pdf_file.read()
-                    pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-                
-                # Clean up temporary file
-                os.unlink(temp_pdf.name)
-                
-                logger.info(f"Successfully converted markdown to PDF (base64), size: {len(pdf_bytes)} bytes")
-                result = {
-                    "success": True,
-                    "filename": output_filename,
-                    "pdf_base64": pdf_base64,
-                    "size_bytes": len(pdf_bytes),
-                    "page_size": page_size,
-                    "margins": {
-                        "top": margin_top,
-                        "right": margin_right,
-                        "bottom": margin_bottom,
-                        "left": margin_left
-                    },
-                    "message": f"Successfully converted markdown to PDF: {output_filename}"
-                }
-                
-                if sanitization_warnings:
-                    result["sanitization_warnings"] = sanitization_warnings
-                    result["message"] += f" (Applied {len(sanitization_warnings)} formatting fixes)"
-                
-                return result
+            # Return the rendered PDF inline, as base64 unless the caller wants bytes
+            if raw_bytes:
+                payload_key, payload = "pdf_bytes", pdf_bytes
+            else:
+                payload_key = "pdf_base64"
+                payload = binascii.b2a_base64(pdf_bytes, newline=False).decode('ascii')
+
+            logger.info("Successfully converted markdown to PDF (base64), size: %s bytes", len(pdf_bytes))
+            result = {
+                "success": True,
+                "filename": output_filename,
+                payload_key: payload,
+                "size_bytes": len(pdf_bytes),
+                "page_size": page_size,
+                "margins": {
+                    "top": margin_top,
+                    "right": margin_right,
+                    "bottom": margin_bottom,
+                    "left": margin_left
+                },
+                "message": f"Successfully converted markdown to PDF: {output_filename}"
+            }
+
+            if sanitization_warnings:
+                result["sanitization_warnings"] = sanitization_warnings
+                result["message"] += f" (Applied {len(sanitization_warnings)} formatting fixes)"
+
+            return result
         else:
             # Save to current directory
-            output_path = Path(output_filename)
-            logger.debug(f"Saving PDF to file: {output_path}")
+            output_path = str(Path(output_filename).absolute())
+            logger.debug("Saving PDF to file: %s", output_path)
             try:
-                pdf.save(str(output_path))
-                file_size = output_path.stat().st_size
-                logger.info(f"Successfully converted markdown to PDF file: {output_path}, size: {file_size} bytes")
+                with open(output_path, 'wb') as fh:
+                    fh.write(pdf_bytes)
+                file_size = len(pdf_bytes)
+                logger.info("Successfully converted markdown to PDF file: %s, size: %s bytes", output_path, file_size)
                 result = {
                     "success": True,
                     "filename": output_filename,
-                    "output_path": str(output_path.absolute()),
+                    "output_path": output_path,
                     "size_bytes": file_size,
                     "page_size": page_size,
                     "margins": {
@@ -402,13 +1017,8 @@ def convert_markdown_to_pdf(
                 }
             except PermissionError as perm_err:
                 # Fallback: return base64 instead of writing to disk
-                logger.warning(f"Permission error while saving PDF: {perm_err}. Falling back to base64 response.")
-                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-                    pdf.save(temp_pdf.name)
-                    with open(temp_pdf.name, 'rb') as pdf_file:
-                        pdf_bytes = pdf_file.read()
-                        pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-                    os.unlink(temp_pdf.name)
+                logger.warning("Permission error while saving PDF: %s. Falling back to base64 response.", perm_err)
+                pdf_base64 = binascii.b2a_base64(pdf_bytes, newline=False).decode('ascii')
                 result = {
                     "success": True,
                     "filename": output_filename,
@@ -432,15 +1042,16 @@ def convert_markdown_to_pdf(
             return result
             
     except Exception as e:
-        logger.error(f"Failed to convert markdown to PDF: {str(e)}", exc_info=True)
+        logger.error("Failed to convert markdown to PDF: %s", e, exc_info=True)
         
         # Provide specific error information based on the error type
-        error_str = str(e).lower()
-        if "hierarchy" in error_str or "bad hierarchy level" in error_str:
+        error_msg = str(e)
+        error_type = getattr(e, "error_type", type(e).__name__)
+        if "hierarchy" in error_msg.lower():
             return {
                 "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
+                "error": error_msg,
+                "error_type": error_type,
                 "message": "PDF conversion failed due to markdown hierarchy issues. This often happens with malformed tables or incorrect heading levels.",
                 "suggested_fixes": [
                     "Check table formatting: ensure all rows have the same number of columns",
@@ -458,13 +1069,13 @@ def convert_markdown_to_pdf(
         else:
             return {
                 "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
-                "message": f"Failed to convert markdown to PDF: {str(e)}"
+                "error": error_msg,
+                "error_type": error_type,
+                "message": f"Failed to convert markdown to PDF: {error_msg}"
             }
 
 
-@mcp.tool()
+@_pooled_tool
 def convert_markdown_file_to_pdf(
     markdown_file_path: str,
     output_filename: Optional[str] = None,
@@ -499,22 +1110,34 @@ def convert_markdown_file_to_pdf(
             "message": "Markdown file path is required and must be a valid string"
         }
     
-    logger.info(f"Converting markdown file to PDF: {markdown_file_path}")
+    if output_filename is not None and not isinstance(output_filename, str):
+        return {
+            "success": False,
+            "error": "Invalid output_filename: must be a string",
+            "message": "Output filename must be a valid string"
+        }
+    
+    logger.info("Converting markdown file to PDF: %s", markdown_file_path)
     
     try:
         # Read the markdown file
         markdown_path = Path(markdown_file_path)
         
-        if not markdown_path.exists():
-            logger.warning(f"Markdown file not found: {markdown_file_path}")
+        try:
+            file_stat = markdown_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            file_stat = None
+        
+        if file_stat is None:
+            logger.warning("Markdown file not found: %s", markdown_file_path)
             return {
                 "success": False,
                 "error": f"Markdown file not found: {markdown_file_path}",
                 "message": f"The specified markdown file does not exist: {markdown_file_path}"
             }
         
-        if not markdown_path.is_file():
-            logger.warning(f"Path is not a file: {markdown_file_path}")
+        if not stat.S_ISREG(file_stat.st_mode):
+            logger.warning("Path is not a file: %s", markdown_file_path)
             return {
                 "success": False,
                 "error": f"Path is not a file: {markdown_file_path}",
@@ -522,30 +1145,27 @@ def convert_markdown_file_to_pdf(
             }
         
         # Check file extension
-        if not markdown_path.suffix.lower() in ['.md', '.markdown', '.txt']:
-            logger.warning(f"File does not appear to be markdown: {markdown_file_path}")
+        if markdown_path.suffix.lower() not in _MARKDOWN_SUFFIXES:
+            logger.warning("File does not appear to be markdown: %s", markdown_file_path)
             return {
                 "success": False,
                 "error": f"File does not appear to be markdown: {markdown_file_path}",
                 "message": f"Expected .md, .markdown, or .txt file, got: {markdown_path.suffix}"
             }
         
-        # Read the content with error handling
-        try:
-            markdown_content = markdown_path.read_text(encoding='utf-8')
-        except UnicodeDecodeError:
-            logger.warning(f"Failed to decode file as UTF-8, trying other encodings: {markdown_file_path}")
+        # Read the content once and decode it in memory
+        if file_stat.st_size == 0:
+            markdown_content = ""
+        else:
+            raw_content = markdown_path.read_bytes()
             try:
-                markdown_content = markdown_path.read_text(encoding='latin-1')
-            except Exception as decode_error:
-                return {
-                    "success": False,
-                    "error": f"Failed to decode file: {str(decode_error)}",
-                    "message": f"Could not read the markdown file due to encoding issues: {markdown_file_path}"
-                }
+                markdown_content = raw_content.decode('utf-8')
+            except UnicodeDecodeError:
+                logger.warning("Failed to decode file as UTF-8, falling back to latin-1: %s", markdown_file_path)
+                markdown_content = raw_content.decode('latin-1')
         
-        if not markdown_content.strip():
-            logger.warning(f"Markdown file is empty: {markdown_file_path}")
+        if not markdown_content or markdown_content.isspace():
+            logger.warning("Markdown file is empty: %s", markdown_file_path)
             return {
                 "success": False,
                 "error": "Markdown file is empty",
@@ -556,58 +1176,149 @@ def convert_markdown_file_to_pdf(
         if not output_filename:
             output_filename = markdown_path.stem
             
-        # Convert using the main conversion function
-        return convert_markdown_to_pdf(
-            markdown_content=markdown_content,
-            output_filename=output_filename,
-            return_base64=return_base64,
-            page_size=page_size,
-            margin_top=margin_top,
-            margin_right=margin_right,
-            margin_bottom=margin_bottom,
-            margin_left=margin_left
-        )
+        # The content is already known to be a non-empty string
+        page_args = (page_size, margin_top, margin_right, margin_bottom, margin_left)
+        return _convert_validated(markdown_content, output_filename, return_base64, page_args)
         
     except Exception as e:
-        logger.error(f"Failed to process markdown file {markdown_file_path}: {str(e)}", exc_info=True)
+        logger.error("Failed to process markdown file %s: %s", markdown_file_path, e, exc_info=True)
+        error_msg = str(e)
         return {
             "success": False,
-            "error": str(e),
+            "error": error_msg,
             "error_type": type(e).__name__,
-            "message": f"Failed to read markdown file: {str(e)}"
+            "message": f"Failed to read markdown file: {error_msg}"
         }
 
 
-@mcp.tool()
+def _convert_document(document: Any) -> Dict[str, Any]:
+    """Convert one convert_markdown_batch entry."""
+    if not isinstance(document, dict):
+        return {
+            "success": False,
+            "error": "Invalid document: must be an object with markdown_content",
+            "message": "Each batch entry must be an object with the convert_markdown_to_pdf arguments"
+        }
+    try:
+        return convert_markdown_to_pdf(**document)
+    except TypeError as e:
+        return {
+            "success": False,
+            "error": f"Invalid document fields: {str(e)}",
+            "message": "Each batch entry must be an object with the convert_markdown_to_pdf arguments"
+        }
+
+
+@_pooled_tool
+def convert_markdown_batch(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert several markdown documents to PDF in one call.
+    
+    Args:
+        documents: List of objects taking the same fields as convert_markdown_to_pdf
+            (markdown_content is required; output_filename, return_base64,
+            page_size and margin_* are optional)
+        
+    Returns:
+        List of conversion results, in the same order as documents
+    """
+    if not isinstance(documents, list):
+        return [{
+            "success": False,
+            "error": "Invalid documents: must be a list",
+            "message": "documents must be a list of objects with markdown_content"
+        }]
+    
+    logger.info("Converting batch of %s markdown documents", len(documents))
+    
+    # With process rendering enabled, one thread per worker keeps every
+    # worker busy; otherwise rendering holds the GIL and runs in order.
+    workers = min(len(documents), _PROCESS_POOL_WORKERS if _PROCESS_POOL is not None else 1)
+    if workers <= 1:
+        return [_convert_document(document) for document in documents]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="md2pdf-batch") as executor:
+        return list(executor.map(_convert_document, documents))
+
+
+# Monitors poll health_check often; a result this recent (seconds) is reused
+_HEALTH_CHECK_TTL = 5.0
+_health_check_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+@_pooled_tool
 def health_check() -> Dict[str, Any]:
     """
     Check the health status of the markdown to PDF conversion service.
     
+    This is a lightweight probe that loads the PDF backend and runs the
+    sanitizer without rendering; use deep_health_check for a full conversion.
+    Results are reused for a few seconds so frequent polling stays cheap.
+    
+    Returns:
+        Dictionary containing the health status
+    """
+    global _health_check_cache
+    cached = _health_check_cache
+    if cached is not None and time.monotonic() - cached[0] < _HEALTH_CHECK_TTL:
+        return dict(cached[1])
+    
+    result = _probe_health()
+    _health_check_cache = (time.monotonic(), result)
+    return dict(result)
+
+
+def _probe_health() -> Dict[str, Any]:
+    """Run the health_check probe without caching."""
+    try:
+        MarkdownPdf, _ = _get_pdf_cls()
+        MarkdownPdf(toc_level=6, mode='commonmark', optimize=True)
+        sanitize_markdown_content("# Test\n\nThis is a test conversion.")
+        return {
+            "success": True,
+            "status": "healthy",
+            "message": "Markdown to PDF conversion service is working properly",
+            "test_result": "PDF backend loaded and sanitizer responding"
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "status": "unhealthy",
+            "error": str(e),
+            "message": f"Health check failed: {str(e)}"
+        }
+
+
+@_pooled_tool
+def deep_health_check() -> Dict[str, Any]:
+    """
+    Check the conversion service by rendering a small test document to PDF.
+    
+    Unlike health_check this always performs a full render, bypassing the
+    conversion cache.
+    
     Returns:
         Dictionary containing the health status
     """
     try:
         # Test basic conversion functionality
-        test_markdown = "# Test\n\nThis is a test conversion."
-        result = convert_markdown_to_pdf(
-            markdown_content=test_markdown,
-            output_filename="health_check_test",
-            return_base64=True
+        pdf_bytes, _, failure = _render_markdown(
+            "# Test\n\nThis is a test conversion.", _DEFAULT_PAGE_ARGS
         )
         
-        if result.get("success"):
+        if failure is None and pdf_bytes:
             return {
                 "success": True,
                 "status": "healthy",
                 "message": "Markdown to PDF conversion service is working properly",
-                "test_result": "Test conversion completed successfully"
+                "test_result": "Test conversion completed successfully",
+                "size_bytes": len(pdf_bytes)
             }
         else:
             return {
                 "success": False,
                 "status": "unhealthy",
                 "message": "Markdown to PDF conversion service is not working",
-                "error": result.get("error", "Unknown error in test conversion")
+                "error": (failure or {}).get("error", "Unknown error in test conversion")
             }
             
     except Exception as e:
@@ -621,7 +1332,6 @@ def health_check() -> Dict[str, Any]:
 
 # ----------------------------- MCP Resources --------------------------------
 
-@mcp.resource("md2pdf://status")
 def status_resource() -> str:
     """Status information about the markdown to PDF conversion service."""
     try:
@@ -635,7 +1345,9 @@ def status_resource() -> str:
 ## Available Tools
 - convert_markdown_to_pdf: Convert markdown text to PDF
 - convert_markdown_file_to_pdf: Convert markdown file to PDF
+- convert_markdown_batch: Convert several markdown documents in one call
 - health_check: Check service health
+- deep_health_check: Check service health with a full test conversion
 
 ## Supported Features
 - Markdown to PDF conversion
@@ -649,7 +1361,6 @@ def status_resource() -> str:
 
 # ----------------------------- MCP Prompts ----------------------------------
 
-@mcp.prompt()
 def markdown_conversion_help() -> str:
     """
     Guide for using the markdown to PDF conversion tools.
@@ -735,8 +1446,18 @@ All tools return a dictionary with:
 """
 
 
+# Resources and prompts are only served over MCP; HTTP-only builds set GRIMD2PDF_MCP=0
+if os.environ.get("GRIMD2PDF_MCP", "1") == "1":
+    mcp.resource("md2pdf://status")(status_resource)
+    mcp.prompt()(markdown_conversion_help)
+
+
 def main():
     """Main entry point for the MCP server."""
+    multiprocessing.freeze_support()
+    # Default to WARNING so stdio hosts are not flooded on stderr
+    configure_logging("WARNING")
+    enable_process_rendering()
     mcp.run()
 
 
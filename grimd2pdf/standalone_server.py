@@ -10,18 +10,14 @@ import argparse
 import asyncio
 import json
 import logging
+import multiprocessing
+import os
 import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, BinaryIO, List, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, PlainTextResponse
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import uvicorn
-
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.session import ServerSession
@@ -34,13 +30,22 @@ from mcp.types import (
     JSONRPCResponse,
 )
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
 # Handle both relative and absolute imports for PyInstaller compatibility
 try:
-    from .server import convert_markdown_to_pdf, convert_markdown_file_to_pdf, health_check
+    from .server import (
+        convert_markdown_to_pdf, convert_markdown_to_pdf_bytes, convert_markdown_file_to_pdf,
+        health_check, enable_process_rendering, warm_up_renderer, configure_logging,
+    )
 except ImportError:
     # Fallback for when running as standalone script or PyInstaller binary
     try:
-        from grimd2pdf.server import convert_markdown_to_pdf, convert_markdown_file_to_pdf, health_check
+        from grimd2pdf.server import (
+            convert_markdown_to_pdf, convert_markdown_to_pdf_bytes, convert_markdown_file_to_pdf,
+            health_check, enable_process_rendering, warm_up_renderer, configure_logging,
+        )
     except ImportError:
         # Last resort: try importing directly
         import sys
@@ -49,18 +54,151 @@ except ImportError:
         parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         if parent_dir not in sys.path:
             sys.path.insert(0, parent_dir)
-        from grimd2pdf.server import convert_markdown_to_pdf, convert_markdown_file_to_pdf, health_check
+        from grimd2pdf.server import (
+            convert_markdown_to_pdf, convert_markdown_to_pdf_bytes, convert_markdown_file_to_pdf,
+            health_check, enable_process_rendering, warm_up_renderer, configure_logging,
+        )
+
+
+try:
+    import orjson
+except ImportError:  # optional; serializes large base64 payloads much faster
+    orjson = None
+
+
+def _json_response_class() -> type:
+    """Return the JSON response class for the HTTP app, rendered with orjson when available."""
+    from fastapi.responses import JSONResponse
+    
+    if orjson is None:
+        return JSONResponse
+    
+    class OrjsonResponse(JSONResponse):
+        """JSONResponse rendered with orjson."""
+        
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+    
+    return OrjsonResponse
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize a tool result as the indented JSON text sent to MCP clients."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2)
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-# Thread pool for handling concurrent requests
-thread_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="grimd2pdf-worker")
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Thread pool for handling concurrent requests; in HTTP mode these threads only
+# dispatch to the render process pool, so there is one per rendering core
+thread_pool = ThreadPoolExecutor(max_workers=max(4, os.cpu_count() or 1), thread_name_prefix="grimd2pdf-worker")
+
+# Tool definitions shared by the MCP list_tools handler and GET /mcp/tools
+TOOLS_SCHEMA: List[Dict[str, Any]] = [
+    {
+        "name": "convert_markdown_to_pdf",
+        "description": "Convert markdown content directly to PDF format",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "markdown_content": {
+                    "type": "string",
+                    "description": "The markdown text to convert to PDF"
+                },
+                "output_filename": {
+                    "type": "string",
+                    "description": "Optional filename for the PDF (without extension)"
+                },
+                "return_base64": {
+                    "type": "boolean",
+                    "description": "If True, returns PDF as base64 encoded string",
+                    "default": False
+                }
+            },
+            "required": ["markdown_content"]
+        }
+    },
+    {
+        "name": "convert_markdown_file_to_pdf",
+        "description": "Convert a markdown file to PDF format",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "markdown_file_path": {
+                    "type": "string",
+                    "description": "Path to the markdown file to convert"
+                },
+                "output_filename": {
+                    "type": "string",
+                    "description": "Optional filename for the PDF (without extension)"
+                },
+                "return_base64": {
+                    "type": "boolean",
+                    "description": "If True, returns PDF as base64 encoded string",
+                    "default": False
+                }
+            },
+            "required": ["markdown_file_path"]
+        }
+    },
+    {
+        "name": "health_check",
+        "description": "Check the health status of the markdown to PDF conversion service",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    }
+]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an If-None-Match header value matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _convert_upload(upload: BinaryIO, output_filename: Optional[str], return_base64: bool) -> Dict[str, Any]:
+    """Decode an uploaded markdown file and convert it; runs on the worker pool."""
+    raw_content = upload.read()
+    try:
+        markdown_content = raw_content.decode('utf-8')
+    except UnicodeDecodeError:
+        logger.warning("Uploaded file is not valid UTF-8, falling back to latin-1")
+        markdown_content = raw_content.decode('latin-1')
+    del raw_content  # only the decoded text needs to stay alive while rendering
+    
+    return convert_markdown_to_pdf(markdown_content, output_filename, return_base64)
+
+
+def _call_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a tool from TOOLS_SCHEMA by name; blocking, so callers use the worker pool."""
+    if name == "convert_markdown_to_pdf":
+        return convert_markdown_to_pdf(
+            markdown_content=arguments["markdown_content"],
+            output_filename=arguments.get("output_filename"),
+            return_base64=arguments.get("return_base64", False)
+        )
+    elif name == "convert_markdown_file_to_pdf":
+        return convert_markdown_file_to_pdf(
+            markdown_file_path=arguments["markdown_file_path"],
+            output_filename=arguments.get("output_filename"),
+            return_base64=arguments.get("return_base64", False)
+        )
+    elif name == "health_check":
+        return health_check()
+    else:
+        raise ValueError(f"Unknown tool: {name}")
 
 
 # MCP Server Implementation
@@ -77,87 +215,18 @@ class McpToolServer:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="convert_markdown_to_pdf",
-                    description="Convert markdown content directly to PDF format",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "markdown_content": {
-                                "type": "string",
-                                "description": "The markdown text to convert to PDF"
-                            },
-                            "output_filename": {
-                                "type": "string",
-                                "description": "Optional filename for the PDF (without extension)"
-                            },
-                            "return_base64": {
-                                "type": "boolean",
-                                "description": "If True, returns PDF as base64 encoded string",
-                                "default": False
-                            }
-                        },
-                        "required": ["markdown_content"]
-                    }
-                ),
-                Tool(
-                    name="convert_markdown_file_to_pdf",
-                    description="Convert a markdown file to PDF format",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "markdown_file_path": {
-                                "type": "string",
-                                "description": "Path to the markdown file to convert"
-                            },
-                            "output_filename": {
-                                "type": "string",
-                                "description": "Optional filename for the PDF (without extension)"
-                            },
-                            "return_base64": {
-                                "type": "boolean",
-                                "description": "If True, returns PDF as base64 encoded string",
-                                "default": False
-                            }
-                        },
-                        "required": ["markdown_file_path"]
-                    }
-                ),
-                Tool(
-                    name="health_check",
-                    description="Check the health status of the markdown to PDF conversion service",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                )
-            ]
+            return [Tool(**schema) for schema in TOOLS_SCHEMA]
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Handle tool calls."""
             try:
-                if name == "convert_markdown_to_pdf":
-                    result = convert_markdown_to_pdf(
-                        markdown_content=arguments["markdown_content"],
-                        output_filename=arguments.get("output_filename"),
-                        return_base64=arguments.get("return_base64", False)
-                    )
-                elif name == "convert_markdown_file_to_pdf":
-                    result = convert_markdown_file_to_pdf(
-                        markdown_file_path=arguments["markdown_file_path"],
-                        output_filename=arguments.get("output_filename"),
-                        return_base64=arguments.get("return_base64", False)
-                    )
-                elif name == "health_check":
-                    result = health_check()
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(thread_pool, _call_tool, name, arguments)
                 
                 return [TextContent(
                     type="text",
-                    text=json.dumps(result, indent=2)
+                    text=_dumps_indented(result)
                 )]
                 
             except Exception as e:
@@ -168,7 +237,7 @@ class McpToolServer:
                 }
                 return [TextContent(
                     type="text",
-                    text=json.dumps(error_result, indent=2)
+                    text=_dumps_indented(error_result)
                 )]
     
     async def run_mcp_server(self):
@@ -183,12 +252,21 @@ class McpToolServer:
 
 
 # HTTP Server Implementation (FastAPI)
-def create_http_app() -> FastAPI:
+def create_http_app() -> "FastAPI":
     """Create FastAPI application."""
+    # The web stack is only needed in HTTP mode; importing it here keeps it
+    # out of MCP stdio startup
+    from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Request
+    from fastapi.responses import Response, FileResponse, PlainTextResponse
+    from fastapi.middleware.cors import CORSMiddleware
+    from pydantic import BaseModel
+    
+    _JSONResponse = _json_response_class()
     app = FastAPI(
         title="Grimd2pdf - Mystical Markdown to PDF Server",
         description="MCP-compatible HTTP server for converting markdown files to PDF with mystical powers",
-        version="1.0.0"
+        version="1.0.0",
+        default_response_class=_JSONResponse
     )
     
     # Add CORS middleware
@@ -211,6 +289,9 @@ def create_http_app() -> FastAPI:
         output_filename: Optional[str] = None
         return_base64: bool = False
     
+    class BatchRequest(BaseModel):
+        items: List[ConvertMarkdownRequest]
+    
     # MCP Tool endpoints
     @app.get("/")
     async def root():
@@ -248,43 +329,7 @@ def create_http_app() -> FastAPI:
     @app.get("/mcp/tools")
     async def list_mcp_tools():
         """List available MCP tools."""
-        mcp_server = McpToolServer()
-        tools = await mcp_server._setup_tools()  # This won't work as intended, need to refactor
-        return {
-            "tools": [
-                {
-                    "name": "convert_markdown_to_pdf",
-                    "description": "Convert markdown content directly to PDF format",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "markdown_content": {"type": "string", "description": "The markdown text to convert to PDF"},
-                            "output_filename": {"type": "string", "description": "Optional filename for the PDF (without extension)"},
-                            "return_base64": {"type": "boolean", "description": "If True, returns PDF as base64 encoded string", "default": False}
-                        },
-                        "required": ["markdown_content"]
-                    }
-                },
-                {
-                    "name": "convert_markdown_file_to_pdf", 
-                    "description": "Convert a markdown file to PDF format",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "markdown_file_path": {"type": "string", "description": "Path to the markdown file to convert"},
-                            "output_filename": {"type": "string", "description": "Optional filename for the PDF (without extension)"},
-                            "return_base64": {"type": "boolean", "description": "If True, returns PDF as base64 encoded string", "default": False}
-                        },
-                        "required": ["markdown_file_path"]
-                    }
-                },
-                {
-                    "name": "health_check",
-                    "description": "Check the health status of the markdown to PDF conversion service",
-                    "inputSchema": {"type": "object", "properties": {}}
-                }
-            ]
-        }
+        return {"tools": TOOLS_SCHEMA}
     
     @app.post("/mcp/call")
     async def call_mcp_tool(request: dict):
@@ -293,34 +338,20 @@ def create_http_app() -> FastAPI:
             tool_name = request.get("name")
             arguments = request.get("arguments", {})
             
-            if tool_name == "convert_markdown_to_pdf":
-                result = convert_markdown_to_pdf(
-                    markdown_content=arguments["markdown_content"],
-                    output_filename=arguments.get("output_filename"),
-                    return_base64=arguments.get("return_base64", False)
-                )
-            elif tool_name == "convert_markdown_file_to_pdf":
-                result = convert_markdown_file_to_pdf(
-                    markdown_file_path=arguments["markdown_file_path"],
-                    output_filename=arguments.get("output_filename"),
-                    return_base64=arguments.get("return_base64", False)
-                )
-            elif tool_name == "health_check":
-                result = health_check()
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(thread_pool, _call_tool, tool_name, arguments)
             
             return {
                 "content": [
                     {
                         "type": "text",
-                        "text": json.dumps(result, indent=2)
+                        "text": _dumps_indented(result)
                     }
                 ]
             }
             
         except Exception as e:
-            return JSONResponse(
+            return _JSONResponse(
                 status_code=400,
                 content={
                     "error": {
@@ -336,12 +367,30 @@ def create_http_app() -> FastAPI:
         """Health check endpoint."""
         result = health_check()
         status_code = 200 if result["success"] else 503
-        return JSONResponse(status_code=status_code, content=result)
+        return _JSONResponse(status_code=status_code, content=result)
+    
+    async def pdf_response(request: ConvertMarkdownRequest):
+        """Convert request content and return the PDF bytes as the response body."""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            thread_pool,
+            convert_markdown_to_pdf_bytes,
+            request.markdown_content,
+            request.output_filename
+        )
+        if not result.get("success"):
+            return _JSONResponse(status_code=400, content=result)
+        return Response(content=result["pdf_bytes"], media_type="application/pdf", headers={
+            "Content-Disposition": f"attachment; filename={result['filename']}"
+        })
     
     @app.post("/convert")
-    async def convert_markdown(request: ConvertMarkdownRequest):
-        """Convert markdown content to PDF."""
-        loop = asyncio.get_event_loop()
+    async def convert_markdown(request: ConvertMarkdownRequest, http_request: Request):
+        """Convert markdown content to PDF; send the raw PDF if the client accepts application/pdf."""
+        if "application/pdf" in http_request.headers.get("accept", ""):
+            return await pdf_response(request)
+        
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
             thread_pool,
             convert_markdown_to_pdf,
@@ -350,12 +399,34 @@ def create_http_app() -> FastAPI:
             request.return_base64
         )
         status_code = 200 if result["success"] else 400
-        return JSONResponse(status_code=status_code, content=result)
+        return _JSONResponse(status_code=status_code, content=result)
+    
+    @app.post("/convert-batch")
+    async def convert_batch(request: BatchRequest):
+        """Convert several markdown documents concurrently."""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                thread_pool,
+                convert_markdown_to_pdf,
+                item.markdown_content,
+                item.output_filename,
+                item.return_base64
+            )
+            for item in request.items
+        ), return_exceptions=True)
+        
+        results = [
+            {"success": False, "error": str(result), "message": f"Conversion failed: {result}"}
+            if isinstance(result, Exception) else result
+            for result in results
+        ]
+        return {"results": results}
     
     @app.post("/convert-file")
     async def convert_markdown_file_endpoint(request: ConvertFileRequest):
         """Convert a markdown file to PDF."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
             thread_pool,
             convert_markdown_file_to_pdf,
@@ -364,7 +435,7 @@ def create_http_app() -> FastAPI:
             request.return_base64
         )
         status_code = 200 if result["success"] else 400
-        return JSONResponse(status_code=status_code, content=result)
+        return _JSONResponse(status_code=status_code, content=result)
     
     @app.post("/upload")
     async def upload_and_convert(
@@ -373,66 +444,61 @@ def create_http_app() -> FastAPI:
         return_base64: bool = Form(False)
     ):
         """Upload a markdown file and convert it to PDF."""
+        # Reject by name before touching the upload body
+        if not file.filename or not file.filename.endswith(('.md', '.markdown')):
+            return _JSONResponse(
+                status_code=400,
+                content={"success": False, "error": "File must be a markdown file"}
+            )
+        
         try:
-            if not file.filename.endswith(('.md', '.markdown')):
-                raise HTTPException(status_code=400, detail="File must be a markdown file")
-            
-            content = await file.read()
-            markdown_content = content.decode('utf-8')
-            
             if not output_filename:
                 output_filename = Path(file.filename).stem
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
                 thread_pool,
-                convert_markdown_to_pdf,
-                markdown_content,
+                _convert_upload,
+                file.file,
                 output_filename,
                 return_base64
             )
             
             status_code = 200 if result["success"] else 400
-            return JSONResponse(status_code=status_code, content=result)
+            return _JSONResponse(status_code=status_code, content=result)
             
         except Exception as e:
-            return JSONResponse(
+            return _JSONResponse(
                 status_code=500,
                 content={"success": False, "error": str(e)}
             )
     
     @app.get("/download/{filename}")
-    async def download_file(filename: str):
-        """Download a generated PDF file."""
+    async def download_file(filename: str, request: Request):
+        """Download a generated PDF file, answering 304 when the client copy is current."""
         file_path = Path(filename)
-        if not file_path.exists():
+        try:
+            stat_result = file_path.stat()
+        except OSError:
             raise HTTPException(status_code=404, detail="File not found")
         
-        return FileResponse(
+        response = FileResponse(
             path=str(file_path),
             filename=filename,
-            media_type='application/pdf'
+            media_type='application/pdf',
+            stat_result=stat_result
         )
+        if _etag_matches(request.headers.get("if-none-match"), response.headers["etag"]):
+            return Response(status_code=304, headers={
+                "ETag": response.headers["etag"],
+                "Last-Modified": response.headers["last-modified"],
+            })
+        return response
     
     @app.post("/convert-stream")
     async def convert_stream(request: ConvertMarkdownRequest):
-        """Convert markdown content to PDF and return as streamed octet-stream."""
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            thread_pool,
-            convert_markdown_to_pdf,
-            request.markdown_content,
-            request.output_filename,
-            True  # always return_base64
-        )
-        if not result.get("success"):
-            return JSONResponse(status_code=400, content=result)
-        import base64, io
-        pdf_bytes = base64.b64decode(result["pdf_base64"])
-        filename = (request.output_filename or "converted_markdown") + ".pdf"
-        return StreamingResponse(io.BytesIO(pdf_bytes), media_type="application/pdf", headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        })
+        """Convert markdown content to PDF and return the raw application/pdf body."""
+        return await pdf_response(request)
     
     @app.get("/llm-guide", response_class=PlainTextResponse)
     async def llm_guide():
@@ -467,6 +533,9 @@ Examples:
 
   # Run with debug logging
   grimd2pdf-server --http --debug --port 8000
+
+  # Serve HTTP from 4 worker processes
+  grimd2pdf-server --http --workers 4
         """
     )
     
@@ -501,24 +570,29 @@ Examples:
         help="Enable auto-reload for development (HTTP mode only)"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of HTTP worker processes (default: 1, only used with --http; ignored with --reload)"
+    )
+    
     return parser
 
 
-async def main_async():
+async def main_async(args: argparse.Namespace):
     """Async main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
-    
-    # Configure logging
-    if args.debug:
-        logging.getLogger().setLevel(logging.DEBUG)
-        logger.debug("Debug logging enabled")
-    
     if args.http:
         # HTTP server mode
-        logger.info(f"Starting Grimd2pdf HTTP Server on {args.host}:{args.port}")
-        logger.info(f"MCP-compatible API available at http://{args.host}:{args.port}/mcp/")
-        logger.info(f"API documentation at http://{args.host}:{args.port}/docs")
+        import uvicorn
+        
+        logger.info("Starting Grimd2pdf HTTP Server on %s:%s", args.host, args.port)
+        logger.info("MCP-compatible API available at http://%s:%s/mcp/", args.host, args.port)
+        logger.info("API documentation at http://%s:%s/docs", args.host, args.port)
+        
+        # PyMuPDF layout holds the GIL; render in worker processes so
+        # concurrent requests scale across cores instead of serializing
+        enable_process_rendering(os.cpu_count())
         
         app = create_http_app()
         config = uvicorn.Config(
@@ -526,24 +600,58 @@ async def main_async():
             host=args.host,
             port=args.port,
             reload=args.reload,
+            ws="none",  # no websocket routes; keeps websocket stacks out of the binary
             log_level="debug" if args.debug else "info"
         )
         server = uvicorn.Server(config)
         await server.serve()
     else:
-        # MCP server mode (default)
+        # MCP server mode (default); renders in-process, so warm up off the
+        # event loop while the client is still initializing the session
+        threading.Thread(target=warm_up_renderer, name="grimd2pdf-warmup", daemon=True).start()
         mcp_server = McpToolServer()
         await mcp_server.run_mcp_server()
 
 
+def run_http_workers(args: argparse.Namespace):
+    """Serve HTTP from several uvicorn worker processes."""
+    import uvicorn
+    
+    logger.info("Starting Grimd2pdf HTTP Server on %s:%s with %s workers", args.host, args.port, args.workers)
+    
+    # Each worker is a separate process that renders in-process, so conversions
+    # already spread across cores; a render pool per worker would oversubscribe them
+    uvicorn.run(
+        "grimd2pdf.standalone_server:create_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        ws="none",
+        log_level="debug" if args.debug else "info"
+    )
+
+
 def main():
     """Main entry point."""
+    multiprocessing.freeze_support()  # render workers re-enter the frozen binary
+    args = create_parser().parse_args()
+    
+    # Configure logging; --debug wins over LOG_LEVEL
+    configure_logging("INFO", _LOG_FORMAT)
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+        logger.debug("Debug logging enabled")
+    
     try:
-        asyncio.run(main_async())
+        if args.http and args.workers > 1 and not args.reload:
+            run_http_workers(args)
+        else:
+            asyncio.run(main_async(args))
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server failed: {e}")
+        logger.error("Server failed: %s", e)
         sys.exit(1)
 
 
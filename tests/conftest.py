@@ -0,0 +1,111 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+from grimd2pdf.server import convert_markdown_to_pdf, health_check, warm_up_renderer
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
+
+# 100 sections, each heading and paragraph repeated ten times
+LARGE_MARKDOWN = "# Large Document\n\n" + "".join(
+    f"## Section {i}\n\nThis is section {i} with some content. " * 10 + "\n\n"
+    for i in range(100)
+)
+
+# Latin accents and symbols, covered by the base fonts
+ACCENTED_MARKDOWN = """# Test with Special Characters
+
+## Unicode Test
+- Accents: café, naïve, résumé
+- Symbols: © ® ™ ± ≤ ≥
+
+## Table
+| Name | Age | City |
+|------|-----|------|
+| José | 25  | São Paulo |
+| Åse  | 30  | Oslo |
+"""
+
+# Emoji and CJK text, which make PyMuPDF load its much larger fallback fonts
+EMOJI_CJK_MARKDOWN = """# Test with Emoji and CJK
+
+- Emoji: 🚀 💻 📊
+
+## Code Block
+```python
+def hello_world():
+    print("Hello, 世界!")
+```
+"""
+
+
+if uvloop is not None:
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop where it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warmed_renderer():
+    """Pay PyMuPDF's one-time font and style loading before the first test."""
+    warm_up_renderer()
+
+
+@pytest.fixture(scope="session")
+def basic_pdf_result():
+    """Conversion result for a short document with default page settings."""
+    return convert_markdown_to_pdf(
+        markdown_content="# Test Header\n\nThis is a test paragraph with **bold** text.",
+        output_filename="test_output",
+        return_base64=True
+    )
+
+
+@pytest.fixture(scope="session")
+def letter_pdf_result():
+    """Conversion result for a short document on Letter paper with custom margins."""
+    return convert_markdown_to_pdf(
+        markdown_content="# Test Header\n\nThis is a test with custom options.",
+        output_filename="custom_test",
+        return_base64=True,
+        page_size="Letter",
+        margin_top="2in",
+        margin_left="1.5in"
+    )
+
+
+@pytest.fixture(scope="session")
+def large_pdf_result():
+    """Conversion result for LARGE_MARKDOWN."""
+    return convert_markdown_to_pdf(markdown_content=LARGE_MARKDOWN, return_base64=True)
+
+
+@pytest.fixture(scope="session")
+def accented_pdf_result():
+    """Conversion result for ACCENTED_MARKDOWN."""
+    return convert_markdown_to_pdf(markdown_content=ACCENTED_MARKDOWN, return_base64=True)
+
+
+@pytest.fixture(scope="session")
+def emoji_cjk_pdf_result():
+    """Conversion result for EMOJI_CJK_MARKDOWN."""
+    return convert_markdown_to_pdf(markdown_content=EMOJI_CJK_MARKDOWN, return_base64=True)
+
+
+@pytest.fixture(scope="session")
+def health_result():
+    """Result of one health_check() call."""
+    return health_check()
+
+
+@pytest.fixture(scope="session")
+def shared_md_file(tmp_path_factory):
+    """A markdown file with short canonical content, for tests that need any .md file."""
+    path = tmp_path_factory.mktemp("markdown") / "doc.md"
+    path.write_text("# File Test\n\nThis is content from a file.", encoding="utf-8")
+    return path
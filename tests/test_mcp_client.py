@@ -4,65 +4,113 @@ Test script to validate MCP server functionality
 """
 import asyncio
 import json
-import os
 import sys
-import tempfile
 from pathlib import Path
 import pytest
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 
-@pytest.mark.asyncio
-async def test_mcp_server():
-    """Test the MCP server by calling the conversion tool"""
+# A hung stdio server should fail these tests quickly rather than stall the run
+pytestmark = pytest.mark.timeout(20)
+
+TEST_MARKDOWN = "# Test Document\n\nThis is a test markdown document for MCP server testing."
+
+# Server parameters that work in any environment
+SERVER_PARAMS = {
+    "command": sys.executable,  # Use the current Python interpreter
+    "args": ["-m", "grimd2pdf.server"],
+    "cwd": str(Path.cwd()),  # Use current directory instead of hardcoded path
+}
+
+
+@pytest.fixture(scope="module")
+async def mcp_session():
+    """One initialized MCP session, shared by the tests in this module."""
+    # Imported here so collecting or deselecting these tests skips the client stack
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
     
-    # Get the current working directory (works in both local and CI)
-    current_dir = Path.cwd()
+    # The stdio client's task groups must be entered and exited by the same task,
+    # and pytest-asyncio may tear fixtures down from another; keep them in one
+    ready = asyncio.get_running_loop().create_future()
+    finished = asyncio.Event()
     
-    # Server parameters that work in any environment
-    server_params = StdioServerParameters(
-        command=sys.executable,  # Use the current Python interpreter
-        args=["-m", "grimd2pdf.server"],
-        cwd=str(current_dir)  # Use current directory instead of hardcoded path
-    )
+    async def hold_session():
+        try:
+            async with stdio_client(StdioServerParameters(**SERVER_PARAMS)) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await finished.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            raise
     
-    # Create a temporary markdown file for testing
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as temp_file:
-        temp_file.write("# Test Document\n\nThis is a test markdown document for MCP server testing.")
-        temp_file_path = temp_file.name
+    holder = asyncio.create_task(hold_session())
+    yield await ready
+    finished.set()
+    await holder
+
+
+@pytest.fixture(scope="module")
+async def mcp_tool_names(mcp_session):
+    """Names of the tools the shared MCP session advertises."""
+    tools = await mcp_session.list_tools()
+    return [tool.name for tool in tools.tools]
+
+
+async def test_mcp_list_tools(mcp_tool_names):
+    """Test that the MCP server advertises its tools"""
+    tool_names = mcp_tool_names
     
-    try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize the session
-                await session.initialize()
-                
-                print("✓ MCP Server initialized successfully")
-                
-                # List available tools
-                tools = await session.list_tools()
-                print(f"✓ Available tools: {[tool.name for tool in tools.tools]}")
-                
-                # Test the conversion tool with the temporary file
-                result = await session.call_tool(
-                    "convert_markdown_to_pdf",
-                    {
-                        "markdown_content": "# Test Document\n\nThis is a test markdown document for MCP server testing.",
-                        "output_filename": "mcp-server-test",
-                        "return_base64": True
-                    }
-                )
-                
-                print("✓ Tool call completed")
-                print(f"Result: {json.dumps(result.content[0].text, indent=2)}")
-                
-                return result
-    finally:
-        # Clean up the temporary file
-        try:
-            os.unlink(temp_file_path)
-        except OSError:
-            pass  # Ignore errors if file doesn't exist
+    assert "convert_markdown_to_pdf" in tool_names
+    assert "convert_markdown_file_to_pdf" in tool_names
+    assert "health_check" in tool_names
+
+
+# Tool name -> call arguments; markdown_file_path is filled in from shared_md_file
+MCP_TOOL_CALLS = {
+    "convert_markdown_to_pdf": {
+        "markdown_content": TEST_MARKDOWN,
+        "output_filename": "mcp-server-test",
+        "return_base64": True
+    },
+    "convert_markdown_file_to_pdf": {
+        "output_filename": "mcp-server-file-test",
+        "return_base64": True
+    },
+    "health_check": {},
+}
+
+
+@pytest.fixture(scope="module")
+async def mcp_tool_results(mcp_session, shared_md_file):
+    """Payloads for every MCP_TOOL_CALLS entry, requested concurrently over one session."""
+    calls = {tool: dict(args) for tool, args in MCP_TOOL_CALLS.items()}
+    calls["convert_markdown_file_to_pdf"]["markdown_file_path"] = str(shared_md_file)
+    
+    results = await asyncio.gather(*(
+        mcp_session.call_tool(tool, args) for tool, args in calls.items()
+    ))
+    return {tool: json.loads(result.content[0].text) for tool, result in zip(calls, results)}
+
+
+@pytest.mark.parametrize("tool", ["convert_markdown_to_pdf", "convert_markdown_file_to_pdf"])
+async def test_mcp_server(mcp_tool_results, tool):
+    """Test the MCP server by calling each conversion tool"""
+    payload = mcp_tool_results[tool]
+    
+    assert payload["success"] is True
+    assert payload["filename"] == MCP_TOOL_CALLS[tool]["output_filename"] + ".pdf"
+    assert payload["size_bytes"] > 0
+
+
+async def test_mcp_health_check(mcp_tool_results):
+    """Test the health check tool over MCP"""
+    payload = mcp_tool_results["health_check"]
+    
+    assert payload["success"] is True
+    assert payload["status"] == "healthy"
+
 
 if __name__ == "__main__":
-    result = asyncio.run(test_mcp_server())
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,36 +2,60 @@
 Tests for the MCP server functionality.
 """
 
+import base64
+import multiprocessing
+import threading
 import pytest
 import json
-from grimd2pdf.server import convert_markdown_to_pdf, convert_markdown_file_to_pdf, health_check
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from grimd2pdf.server import (
+    convert_markdown_to_pdf,
+    convert_markdown_to_pdf_bytes,
+    convert_markdown_file_to_pdf,
+    convert_markdown_batch,
+    health_check,
+    deep_health_check,
+    sanitize_markdown_content,
+)
 
 
-def test_convert_markdown_to_pdf_basic():
-    """Test basic markdown to PDF conversion."""
-    markdown_content = "# Test Header\n\nThis is a test paragraph with **bold** text."
-    
-    result = convert_markdown_to_pdf(
-        markdown_content=markdown_content,
-        output_filename="test_output",
-        return_base64=True
-    )
+def _pdf_header_ok(pdf_base64):
+    """Check the PDF signature by decoding only the first base64 block."""
+    return base64.b64decode(pdf_base64[:12]).startswith(b"%PDF-")
+
+
+# Scenario name -> (expected result fields, minimum PDF size); results come from
+# the "<scenario>_pdf_result" session fixtures in conftest.py
+@pytest.mark.parametrize("scenario,expected,min_size", [
+    ("basic", {"filename": "test_output.pdf", "page_size": "A4"}, 0),
+    ("letter", {
+        "filename": "custom_test.pdf",
+        "page_size": "Letter",
+        "margins": {"top": "2in", "right": "1in", "bottom": "1in", "left": "1.5in"},
+    }, 0),
+    pytest.param("large", {}, 1000, marks=[pytest.mark.slow, pytest.mark.timeout(60)]),  # should be a substantial PDF
+    ("accented", {}, 0),
+    pytest.param("emoji_cjk", {}, 0, marks=pytest.mark.slow),
+], ids=["basic", "letter", "large", "accented", "emoji_cjk"])
+def test_convert_markdown_to_pdf(request, scenario, expected, min_size):
+    """Test markdown to PDF conversion across content and page-setting scenarios."""
+    result = request.getfixturevalue(f"{scenario}_pdf_result")
     
     assert result["success"] is True
-    assert "pdf_base64" in result
-    assert result["filename"] == "test_output.pdf"
-    assert result["size_bytes"] > 0
+    assert _pdf_header_ok(result["pdf_base64"])
+    assert result["size_bytes"] > min_size
     assert "page_size" in result
     assert "margins" in result
+    for field, value in expected.items():
+        assert result[field] == value
 
 
-def test_convert_markdown_to_pdf_with_options():
-    """Test markdown to PDF conversion with custom options."""
-    markdown_content = "# Test Header\n\nThis is a test with custom options."
+def test_convert_markdown_page_settings_applied():
+    """Test that page size and margins shape the PDF pages."""
+    import pymupdf
     
     result = convert_markdown_to_pdf(
-        markdown_content=markdown_content,
-        output_filename="custom_test",
+        markdown_content="# Letter\n\nPage settings test.",
         return_base64=True,
         page_size="Letter",
         margin_top="2in",
@@ -39,9 +63,37 @@ def test_convert_markdown_to_pdf_with_options():
     )
     
     assert result["success"] is True
-    assert result["page_size"] == "Letter"
-    assert result["margins"]["top"] == "2in"
-    assert result["margins"]["left"] == "1.5in"
+    page = pymupdf.open(stream=base64.b64decode(result["pdf_base64"]), filetype="pdf")[0]
+    assert (page.rect.width, page.rect.height) == (612, 792)
+    assert "@page" not in page.get_text()
+    x0, y0 = page.get_text("blocks")[0][:2]
+    assert x0 >= 1.5 * 72 and y0 >= 2 * 72
+
+
+def test_convert_markdown_invalid_page_settings(caplog):
+    """Test that unusable page settings are reported instead of rendered."""
+    for settings in ({"page_size": "NotAPaper"}, {"margin_top": "wide"}, {"margin_left": "5in", "margin_right": "5in"}):
+        result = convert_markdown_to_pdf(markdown_content="# Test", return_base64=True, **settings)
+        assert result["success"] is False
+        assert result["error_type"] == "ValueError"
+    
+    # Caller typos are not logged as conversion failures
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_convert_markdown_unitless_margins():
+    """Test that bare numbers are accepted as margins, in points."""
+    result = convert_markdown_to_pdf(
+        markdown_content="# Zero Margins",
+        return_base64=True,
+        margin_top="0",
+        margin_right="0",
+        margin_bottom="0",
+        margin_left="36"
+    )
+    
+    assert result["success"] is True
+    assert result["margins"]["top"] == "0"
 
 
 def test_convert_markdown_invalid_input():
@@ -56,27 +108,62 @@ def test_convert_markdown_invalid_input():
     assert result["success"] is False
 
 
-def test_convert_markdown_file_to_pdf():
+def test_convert_markdown_to_pdf_bytes():
+    """Test conversion that returns raw PDF bytes instead of base64."""
+    markdown_content = "# Bytes\n\nRaw PDF output."
+    result = convert_markdown_to_pdf_bytes(markdown_content=markdown_content)
+    encoded = convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True)
+    
+    assert result["success"] is True
+    assert "pdf_base64" not in result
+    assert result["pdf_bytes"].startswith(b"%PDF")
+    assert result["pdf_bytes"] == base64.b64decode(encoded["pdf_base64"])
+    assert result["size_bytes"] == len(result["pdf_bytes"])
+    
+    assert convert_markdown_to_pdf_bytes(markdown_content="  ")["success"] is False
+
+
+def test_convert_markdown_batch():
+    """Test converting several documents in one call."""
+    results = convert_markdown_batch(documents=[
+        {"markdown_content": "# First\n\nOne.", "return_base64": True},
+        {"markdown_content": "", "return_base64": True},
+        {"markdown_content": "# Third\n\nThree.", "output_filename": "third", "return_base64": True},
+        "not a document",
+    ])
+    
+    assert len(results) == 4
+    assert results[0]["success"] is True
+    assert results[1]["success"] is False
+    assert results[2]["success"] is True
+    assert results[2]["filename"] == "third.pdf"
+    assert results[3]["success"] is False
+
+
+def test_convert_markdown_file_to_pdf(shared_md_file):
     """Test converting a markdown file to PDF."""
-    # Create a temporary markdown file
-    import tempfile
-    import os
+    result = convert_markdown_file_to_pdf(
+        markdown_file_path=str(shared_md_file),
+        return_base64=True
+    )
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as temp_file:
-        temp_file.write("# File Test\n\nThis is content from a file.")
-        temp_file_path = temp_file.name
+    assert result["success"] is True
+    assert "pdf_base64" in result
+    assert result["size_bytes"] > 0
+
+
+def test_convert_markdown_file_latin1_fallback(tmp_path):
+    """Test converting a file that is not valid UTF-8."""
+    markdown_file = tmp_path / "latin1.md"
+    markdown_file.write_bytes("# Caf\u00e9\n\nR\u00e9sum\u00e9 in latin-1.".encode('latin-1'))
     
-    try:
-        result = convert_markdown_file_to_pdf(
-            markdown_file_path=temp_file_path,
-            return_base64=True
-        )
-        
-        assert result["success"] is True
-        assert "pdf_base64" in result
-        assert result["size_bytes"] > 0
-    finally:
-        os.unlink(temp_file_path)
+    result = convert_markdown_file_to_pdf(
+        markdown_file_path=str(markdown_file),
+        return_base64=True
+    )
+    
+    assert result["success"] is True
+    assert result["size_bytes"] > 0
 
 
 def test_convert_markdown_file_not_found():
@@ -89,29 +176,22 @@ def test_convert_markdown_file_not_found():
     assert "not found" in result["error"].lower()
 
 
-def test_convert_markdown_file_invalid_extension():
+def test_convert_markdown_file_invalid_extension(tmp_path):
     """Test conversion with invalid file extension."""
-    import tempfile
-    import os
+    markdown_file = tmp_path / "doc.invalid"
+    markdown_file.write_text("# Test content")
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.invalid', delete=False) as temp_file:
-        temp_file.write("# Test content")
-        temp_file_path = temp_file.name
+    result = convert_markdown_file_to_pdf(
+        markdown_file_path=str(markdown_file)
+    )
     
-    try:
-        result = convert_markdown_file_to_pdf(
-            markdown_file_path=temp_file_path
-        )
-        
-        assert result["success"] is False
-        assert "markdown" in result["error"].lower()
-    finally:
-        os.unlink(temp_file_path)
+    assert result["success"] is False
+    assert "markdown" in result["error"].lower()
 
 
-def test_health_check():
+def test_health_check(health_result):
     """Test the health check functionality."""
-    result = health_check()
+    result = health_result
     
     assert "success" in result
     assert "status" in result
@@ -123,89 +203,209 @@ def test_health_check():
         assert result["status"] == "unhealthy"
 
 
-def test_large_markdown_content():
-    """Test conversion with large markdown content."""
-    # Create large markdown content (simulate large document)
-    large_content = "# Large Document\n\n"
-    for i in range(100):
-        large_content += f"## Section {i}\n\nThis is section {i} with some content. " * 10
-        large_content += "\n\n"
-    
-    result = convert_markdown_to_pdf(
-        markdown_content=large_content,
-        return_base64=True
-    )
+def test_deep_health_check():
+    """Test the full-render health check."""
+    result = deep_health_check()
     
     assert result["success"] is True
-    assert result["size_bytes"] > 1000  # Should be a substantial PDF
+    assert result["status"] == "healthy"
+    assert result["size_bytes"] > 0
 
 
-def test_markdown_with_special_characters():
-    """Test conversion with special characters and Unicode."""
-    markdown_content = """# Test with Special Characters
+def _convert_together(barrier, i):
+    """Wait until every worker is ready, then convert, so renders actually overlap."""
+    if barrier is not None:
+        barrier.wait(timeout=5)
+    return convert_markdown_to_pdf(
+        markdown_content=f"# Worker {i}\n\nThis is content from worker {i}.",
+        output_filename=f"worker_{i}",
+        return_base64=True
+    )
 
-## Unicode Test
-- Emoji: 🚀 💻 📊
-- Accents: café, naïve, résumé
-- Symbols: © ® ™ ± ≤ ≥
 
-## Code Block
-```python
-def hello_world():
-    print("Hello, 世界!")
-```
+@pytest.mark.slow
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("make_executor,make_barrier", [
+    (lambda: ThreadPoolExecutor(max_workers=5), lambda: threading.Barrier(5)),
+    # spawn, not fork: other tests leave worker threads alive in this process.
+    # Processes share no renderer state, so there is nothing to line up.
+    (lambda: ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")),
+     lambda: None),
+], ids=["threads", "processes"])
+def test_concurrent_requests(make_executor, make_barrier):
+    """Test handling multiple concurrent conversion requests."""
+    barrier = make_barrier()
+    with make_executor() as executor:
+        futures = [executor.submit(_convert_together, barrier, i) for i in range(5)]
+        results = [future.result() for future in as_completed(futures)]
+    
+    assert len(results) == 5
+    
+    for result in results:
+        assert result["success"] is True
+        assert result["size_bytes"] > 0
 
-## Table
-| Name | Age | City |
-|------|-----|------|
-| José | 25  | São Paulo |
-| Åse  | 30  | Oslo |
-"""
+
+def test_repeated_conversion_reuses_cached_pdf():
+    """Test that converting identical content twice returns the cached PDF."""
+    markdown_content = "# Cached\n\n|A|B|\n|1|2|"
     
-    result = convert_markdown_to_pdf(
+    first = convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True)
+    second = convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True)
+    
+    assert first["success"] is True
+    assert second["pdf_base64"] == first["pdf_base64"]
+    assert second["sanitization_warnings"] == first["sanitization_warnings"]
+    
+    # Different page settings must not hit the same cache entry
+    letter = convert_markdown_to_pdf(
         markdown_content=markdown_content,
-        return_base64=True
+        return_base64=True,
+        page_size="Letter"
     )
+    assert letter["success"] is True
+    assert letter["pdf_base64"] != first["pdf_base64"]
+
+
+def test_sanitize_adds_space_after_list_markers():
+    """Test that list markers missing a space are fixed without duplicating text."""
+    sanitized, _ = sanitize_markdown_content("1.First\n  2.Second\n-dash\n*star")
     
-    assert result["success"] is True
-    assert result["size_bytes"] > 0
+    assert sanitized == "1. First\n  2. Second\n- dash\n* star\n"
 
 
-def test_concurrent_requests():
-    """Test handling multiple concurrent conversion requests."""
-    import threading
+def test_sanitize_fixes_heading_jump_in_place():
+    """Test that heading fixes rewrite the offending heading, not an earlier match."""
+    content = "# Title\n\nThe literal `### Step` marker.\n\n### Step\n"
+    
+    sanitized, warnings = sanitize_markdown_content(content)
+    
+    assert sanitized == "# Title\n\nThe literal `### Step` marker.\n\n## Step\n"
+    assert warnings == ["Fixed heading hierarchy jump from level 1 to 3"]
+
+
+def test_pdf_cache_persists_to_disk(tmp_path, monkeypatch):
+    """Test that GRIMD2PDF_CACHE_DIR keeps rendered PDFs across in-memory cache loss."""
+    from grimd2pdf import server
+    
+    monkeypatch.setattr(server, "_PDF_CACHE_DIR", str(tmp_path))
+    markdown_content = "# Disk Cache\n\nPersisted render."
+    
+    first = convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True)
+    assert first["success"] is True
+    assert len(list(tmp_path.glob("*.pdf"))) == 1
+    
+    monkeypatch.setattr(server, "_PDF_CACHE", server.OrderedDict())
+    monkeypatch.setattr(server, "_render_markdown", None)  # a render attempt would fail
+    second = convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True)
+    
+    assert second["success"] is True
+    assert second["pdf_base64"] == first["pdf_base64"]
+
+
+def test_pdf_disk_cache_is_bounded_and_versioned(tmp_path, monkeypatch):
+    """Test that the on-disk cache prunes its oldest entries and is keyed by renderer version."""
+    import os
+    from grimd2pdf import server
+    
+    monkeypatch.setattr(server, "_PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(server, "_PDF_DISK_CACHE_MAX_ENTRIES", 2)
+    keys = [server._pdf_cache_key(f"# Doc {i}", server._DEFAULT_PAGE_ARGS) for i in range(3)]
+    for age, key in enumerate(keys):
+        server._pdf_cache_store(key, b"%PDF-1.7 doc", [])
+        os.utime(server._pdf_cache_path(key).with_suffix(".pdf"), (age, age))
+    
+    assert len(list(tmp_path.glob("*.pdf"))) == 2
+    assert server._pdf_cache_load(keys[0]) is None
+    assert server._pdf_cache_load(keys[2]) is not None
+    
+    monkeypatch.setattr(server, "_renderer_version", lambda: "markdown-pdf=next")
+    assert server._pdf_cache_load(keys[2]) is None
+
+
+def test_concurrent_identical_conversions_render_once(monkeypatch):
+    """Test that identical conversions in flight at the same time share one render."""
     import time
+    from grimd2pdf import server
+    
+    render_calls = []
+    real_render = server._render_markdown
     
+    def slow_render(markdown_content, page_args):
+        render_calls.append(markdown_content)
+        time.sleep(0.2)
+        return real_render(markdown_content, page_args)
+    
+    monkeypatch.setattr(server, "_render_markdown", slow_render)
+    markdown_content = "# Coalesced\n\nRendered once for every waiting caller."
     results = []
-    errors = []
-    
-    def convert_worker(worker_id):
-        try:
-            markdown_content = f"# Worker {worker_id}\n\nThis is content from worker {worker_id}."
-            result = convert_markdown_to_pdf(
-                markdown_content=markdown_content,
-                output_filename=f"worker_{worker_id}",
-                return_base64=True
-            )
-            results.append(result)
-        except Exception as e:
-            errors.append(str(e))
-    
-    # Start multiple threads
-    threads = []
-    for i in range(5):
-        thread = threading.Thread(target=convert_worker, args=(i,))
-        threads.append(thread)
-        thread.start()
     
-    # Wait for all threads to complete
+    def convert_worker():
+        results.append(convert_markdown_to_pdf(markdown_content=markdown_content, return_base64=True))
+    
+    threads = [threading.Thread(target=convert_worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
     for thread in threads:
         thread.join()
     
-    # Check results
-    assert len(errors) == 0, f"Errors occurred: {errors}"
-    assert len(results) == 5
+    assert len(render_calls) == 1
+    assert len(results) == 4
+    assert all(result["success"] is True for result in results)
+    assert len({result["pdf_base64"] for result in results}) == 1
+
+
+def test_health_check_reuses_recent_result(monkeypatch):
+    """Test that health_check reuses a fresh result instead of probing again."""
+    from grimd2pdf import server
     
-    for result in results:
-        assert result["success"] is True
-        assert result["size_bytes"] > 0
\ No newline at end of file
+    probes = []
+    
+    def probe():
+        probes.append(1)
+        return {"success": True, "status": "healthy", "message": "ok"}
+    
+    monkeypatch.setattr(server, "_health_check_cache", None)
+    monkeypatch.setattr(server, "_probe_health", probe)
+    
+    first = health_check()
+    first["status"] = "mutated by caller"
+    second = health_check()
+    assert len(probes) == 1
+    assert second["status"] == "healthy"
+    
+    monkeypatch.setattr(server, "_HEALTH_CHECK_TTL", 0.0)
+    health_check()
+    assert len(probes) == 2
+
+
+def test_max_workers_env_falls_back_on_bad_values(monkeypatch):
+    """Test that an unusable MAX_WORKERS falls back to the default instead of failing."""
+    import os
+    from grimd2pdf import server
+    
+    default = os.cpu_count() or 2
+    for value, expected in (("3", 3), ("", default), ("0", default), ("auto", default), ("-2", default)):
+        monkeypatch.setenv("MAX_WORKERS", value)
+        assert server._max_workers_from_env() == expected
+
+
+def test_import_leaves_root_logging_unconfigured():
+    """Test that importing the package does not configure the root logger."""
+    import subprocess
+    import sys
+    
+    code = "import logging, grimd2pdf.standalone_server; print(len(logging.getLogger().handlers))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    
+    assert output.strip() == "0"
+
+
+def test_convert_markdown_batch_unhashable_page_setting():
+    """Test that a non-string page setting fails its own entry with a conversion error."""
+    results = convert_markdown_batch(documents=[
+        {"markdown_content": "# Bad Margin", "margin_top": ["1in"], "return_base64": True},
+    ])
+    
+    assert results[0]["success"] is False
+    assert "Invalid document fields" not in results[0]["error"]
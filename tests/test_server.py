@@ -1,31 +1,46 @@
+import asyncio
+import base64
 import pytest
-from fastapi.testclient import TestClient
+import httpx
 import io
 import json
 
 from grimd2pdf.standalone_server import create_http_app
 
-app = create_http_app()
+_MD_TEXT = "# Test Header\n\nThis is a test paragraph."
+_MD_BYTES = _MD_TEXT.encode("utf-8")
 
-client = TestClient(app)
+@pytest.fixture(scope="session")
+def app():
+    return create_http_app()
 
-def test_health_check():
-    response = client.get("/health")
+@pytest.fixture(scope="session")
+async def aclient(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+@pytest.fixture(scope="session")
+async def http_health_response(aclient):
+    return await aclient.get("/health")
+
+async def test_health_check(http_health_response):
+    response = http_health_response
     assert response.status_code == 200
     result = response.json()
     assert result["success"] == True
     assert result["status"] == "healthy"
     assert "message" in result
 
-def test_convert_markdown_to_pdf():
+async def test_convert_markdown_to_pdf(aclient):
     # Test the /convert endpoint with JSON payload
     request_data = {
-        "markdown_content": "# Test Header\n\nThis is a test paragraph.",
+        "markdown_content": _MD_TEXT,
         "output_filename": "test_output",
         "return_base64": True
     }
     
-    response = client.post(
+    response = await aclient.post(
         "/convert",
         json=request_data
     )
@@ -39,12 +54,11 @@ def test_convert_markdown_to_pdf():
     assert result["filename"] == "test_output.pdf"
     assert "message" in result
 
-def test_upload_and_convert():
+async def test_upload_and_convert(aclient):
     # Test the /upload endpoint with file upload
-    markdown_content = b"# Test Header\n\nThis is a test paragraph."
-    file_to_upload = ("test.md", io.BytesIO(markdown_content), "text/markdown")
+    file_to_upload = ("test.md", io.BytesIO(_MD_BYTES), "text/markdown")
     
-    response = client.post(
+    response = await aclient.post(
         "/upload",
         files={"file": file_to_upload},
         data={"return_base64": "true"}
@@ -58,37 +72,52 @@ def test_upload_and_convert():
     assert "pdf_base64" in result
     assert "message" in result
 
-def test_convert_with_bad_request():
-    # Send a POST request without required fields
-    response = client.post("/convert", json={})
-    assert response.status_code == 422  # Unprocessable Entity
-    
-    # Send a POST with invalid markdown_content
-    response = client.post("/convert", json={"markdown_content": ""})
-    assert response.status_code == 400  # Bad request due to empty content
+async def test_convert_with_bad_request(aclient):
+    missing_fields, empty_content = await asyncio.gather(
+        # Send a POST request without required fields
+        aclient.post("/convert", json={}),
+        # Send a POST with invalid markdown_content
+        aclient.post("/convert", json={"markdown_content": ""}),
+    )
+    assert missing_fields.status_code == 422  # Unprocessable Entity
+    assert empty_content.status_code == 400  # Bad request due to empty content
 
-def test_upload_with_bad_file():
+async def test_upload_with_bad_file(aclient):
     # Upload non-markdown file
     content = b"Not a markdown file"
     file_to_upload = ("test.txt", io.BytesIO(content), "text/plain")
     
-    response = client.post(
+    response = await aclient.post(
         "/upload",
         files={"file": file_to_upload}
     )
-    # The server returns 500 for this error, which is acceptable
-    assert response.status_code in [400, 500]  # Either bad request or internal error
+    assert response.status_code == 400
     result = response.json()
     assert result["success"] == False
 
-def test_convert_file_endpoint():
+async def test_upload_latin1_file(aclient):
+    # Uploads that are not valid UTF-8 fall back to latin-1 like file conversion
+    file_to_upload = ("cafe.md", io.BytesIO("# Caf\u00e9\n\nR\u00e9sum\u00e9".encode("latin-1")), "text/markdown")
+    
+    response = await aclient.post(
+        "/upload",
+        files={"file": file_to_upload},
+        data={"return_base64": "true"}
+    )
+    
+    assert response.status_code == 200
+    result = response.json()
+    assert result["success"] == True
+    assert result["filename"] == "cafe.pdf"
+
+async def test_convert_file_endpoint(aclient):
     # Test the /convert-file endpoint
     request_data = {
         "markdown_file_path": "sample-document.md",
         "return_base64": True
     }
     
-    response = client.post(
+    response = await aclient.post(
         "/convert-file",
         json=request_data
     )
@@ -97,4 +126,99 @@ def test_convert_file_endpoint():
     assert response.status_code in [200, 400]
     result = response.json()
     assert "success" in result
-    assert "message" in result 
\ No newline at end of file
+    assert "message" in result 
+async def test_download_not_modified(aclient, tmp_path, monkeypatch):
+    # Converted files are written to and served from the working directory
+    monkeypatch.chdir(tmp_path)
+    response = await aclient.post(
+        "/convert",
+        json={"markdown_content": _MD_TEXT, "output_filename": "download_test"}
+    )
+    assert response.status_code == 200
+    
+    response = await aclient.get("/download/download_test.pdf")
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF-")
+    etag = response.headers["etag"]
+    
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = await aclient.get("/download/download_test.pdf", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+    
+    response = await aclient.get("/download/download_test.pdf", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+async def test_convert_batch(aclient):
+    # Each item succeeds or fails on its own; results come back in input order
+    response = await aclient.post("/convert-batch", json={"items": [
+        {"markdown_content": _MD_TEXT, "output_filename": "batch_first", "return_base64": True},
+        {"markdown_content": "", "return_base64": True},
+        {"markdown_content": "# Fence\n\n```python\nprint('never closed')\n", "output_filename": "batch_fence", "return_base64": True},
+    ]})
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0]["success"] == True
+    assert results[0]["filename"] == "batch_first.pdf"
+    assert results[1]["success"] == False
+    assert results[2]["success"] == False
+    assert "code block" in str(results[2]["validation_errors"]).lower()
+
+async def test_convert_batch_exception_becomes_failure(aclient, monkeypatch):
+    # An unexpected error in one conversion is reported in its slot, not raised
+    from grimd2pdf import standalone_server
+    real_convert = standalone_server.convert_markdown_to_pdf
+    
+    def flaky_convert(markdown_content, *args):
+        if "explode" in markdown_content:
+            raise RuntimeError("renderer exploded")
+        return real_convert(markdown_content, *args)
+    
+    monkeypatch.setattr(standalone_server, "convert_markdown_to_pdf", flaky_convert)
+    response = await aclient.post("/convert-batch", json={"items": [
+        {"markdown_content": "# explode"},
+        {"markdown_content": _MD_TEXT, "return_base64": True},
+    ]})
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["success"] == False
+    assert results[0]["error"] == "renderer exploded"
+    assert results[1]["success"] == True
+
+async def test_convert_stream_returns_raw_pdf(aclient):
+    request_data = {"markdown_content": "# Stream\n\nRaw PDF body.", "output_filename": "stream_test"}
+    
+    response = await aclient.post("/convert-stream", json=request_data)
+    encoded = await aclient.post("/convert", json={**request_data, "return_base64": True})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-")
+    assert response.content == base64.b64decode(encoded.json()["pdf_base64"])
+
+async def test_convert_accept_pdf(aclient):
+    # Clients that accept application/pdf get the PDF itself instead of JSON
+    response = await aclient.post(
+        "/convert",
+        json={"markdown_content": _MD_TEXT, "output_filename": "accept_test"},
+        headers={"Accept": "application/pdf"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-")
+    assert "filename=accept_test.pdf" in response.headers["content-disposition"]
+
+async def test_convert_accept_pdf_error_is_json(aclient):
+    response = await aclient.post(
+        "/convert",
+        json={"markdown_content": "   "},
+        headers={"Accept": "application/pdf"}
+    )
+    
+    assert response.status_code == 400
+    assert response.headers["content-type"].startswith("application/json")
+    assert response.json()["success"] == False